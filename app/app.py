@@ -1,4 +1,12 @@
+import os
 import streamlit as st
+from dotenv import load_dotenv
+
+from utils.posting_queue import get_posting_queue
+
+load_dotenv()
+
+DB_EXCEL_PATH = os.getenv("DB_EXCEL_PATH", "data/banking_db.xlsx")
 
 st.set_page_config(page_title="State Bank of Python", page_icon="🏦", layout="wide")
 
@@ -8,3 +16,6 @@ if "is_logged_in" in st.session_state and st.session_state.is_logged_in:
     st.success(f"Logged in as Customer: {st.session_state.get('customer_id')}")
 else:
     st.warning("Not logged in. Please login from 🔐 Login page.")
+
+with st.expander("⚙️ Posting queue metrics"):
+    st.json(get_posting_queue(DB_EXCEL_PATH).metrics())
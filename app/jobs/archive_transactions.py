@@ -0,0 +1,43 @@
+import os
+import sys
+import argparse
+from datetime import date, timedelta
+from dotenv import load_dotenv
+
+# ✅ Make "app/" import root
+APP_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if APP_DIR not in sys.path:
+    sys.path.insert(0, APP_DIR)
+
+from utils.data_store import load_all_sheets, save_all_sheets, write_lock
+from utils.archive import archive_old_transactions
+
+load_dotenv()
+
+DB_EXCEL_PATH = os.getenv("DB_EXCEL_PATH", "data/banking_db.xlsx")
+ARCHIVE_DIR = os.getenv("ARCHIVE_DIR", "data/archive")
+ARCHIVE_AFTER_DAYS = int(os.getenv("ARCHIVE_AFTER_DAYS", "365"))
+
+def main():
+    parser = argparse.ArgumentParser(description="Move old transactions into compressed archive partitions.")
+    parser.add_argument("--days", type=int, default=ARCHIVE_AFTER_DAYS,
+                        help=f"Archive transactions older than this many days (default: {ARCHIVE_AFTER_DAYS})")
+    args = parser.parse_args()
+
+    cutoff = (date.today() - timedelta(days=args.days)).isoformat()
+
+    # Held from load to save, so postings the running app commits meanwhile wait instead of being overwritten
+    with write_lock(DB_EXCEL_PATH):
+        sheets = load_all_sheets(DB_EXCEL_PATH)
+        sheets, summary = archive_old_transactions(sheets, cutoff, ARCHIVE_DIR)
+
+        if not summary["archived_rows"]:
+            print(f"Nothing older than {cutoff} to archive.")
+            return
+
+        # Partitions + manifest are already durable; now shrink the hot sheet
+        save_all_sheets(DB_EXCEL_PATH, sheets)
+    print(f"Archived {summary['archived_rows']} transactions before {cutoff} into {len(summary['partitions'])} partitions.")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+import os
+import sys
+import time
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+from dotenv import load_dotenv
+
+# ✅ Make "app/" import root
+APP_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if APP_DIR not in sys.path:
+    sys.path.insert(0, APP_DIR)
+
+from utils.passwords import hash_password, check_password, hash_iterations
+
+load_dotenv()
+
+def bench(iterations: int, workers: int, logins: int) -> tuple[float, float]:
+    """
+    Returns: (ms per single hash, logins/sec when `logins` verifications share `workers` threads)
+    """
+    stored = hash_password("bench-password", iterations)
+
+    started = time.perf_counter()
+    check_password("bench-password", stored)
+    single_ms = (time.perf_counter() - started) * 1000
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        list(pool.map(lambda _: check_password("bench-password", stored), range(logins)))
+    throughput = logins / (time.perf_counter() - started)
+    return single_ms, throughput
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark PBKDF2 work factors for PASSWORD_HASH_ITERATIONS.")
+    parser.add_argument("--iterations", default="50000,100000,200000,400000,600000",
+                        help="Comma separated iteration counts to try")
+    parser.add_argument("--workers", type=int, default=int(os.getenv("PASSWORD_HASH_WORKERS", "4")))
+    parser.add_argument("--logins", type=int, default=32, help="Verifications per throughput run")
+    parser.add_argument("--target-ms", type=float, default=100.0, help="Per-login hashing budget")
+    args = parser.parse_args()
+
+    print(f"Current PASSWORD_HASH_ITERATIONS={hash_iterations()} • workers={args.workers}")
+    print(f"{'iterations':>10} {'ms/hash':>9} {'logins/s':>9}")
+
+    best = None
+    for it in [int(x) for x in args.iterations.split(",")]:
+        ms, tput = bench(it, args.workers, args.logins)
+        print(f"{it:>10} {ms:>9.1f} {tput:>9.1f}")
+        if ms <= args.target_ms:
+            best = it
+
+    if best:
+        print(f"\nHighest work factor within {args.target_ms:.0f} ms: PASSWORD_HASH_ITERATIONS={best}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,287 @@
+import os
+import re
+import sys
+import random
+import shutil
+import argparse
+import tempfile
+import threading
+import time
+from collections import defaultdict
+import numpy as np
+import pandas as pd
+
+# ✅ Make "app/" import root
+APP_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if APP_DIR not in sys.path:
+    sys.path.insert(0, APP_DIR)
+
+from utils.money import format_inr, to_paise
+
+PAGES_DIR = os.path.join(APP_DIR, "pages")
+PAGES = {
+    "login": "1_Login.py",
+    "summary": "2_Summary.py",
+    "deposit": "3_Deposit.py",
+    "withdraw": "4_Withdraw.py",
+    "statement": "5_Mini_Statement.py",
+}
+DEFAULT_MIX = "deposit:40,withdraw:30,summary:15,statement:15"
+DEFAULT_USERS = "rahul:rahul@123,demo:demo@123"
+# share_apptest_runtime patches Streamlit internals; only trust it on versions it was checked against
+TESTED_STREAMLIT = {(1, 66)}
+TXN_ID_RE = re.compile(r"Txn ID: (T\d+)")
+
+def parse_weights(raw: str) -> dict[str, int]:
+    weights = {}
+    for part in raw.split(","):
+        name, w = part.split(":")
+        if name.strip() not in PAGES:
+            raise ValueError(f"Unknown page in mix: {name}")
+        weights[name.strip()] = int(w)
+    return weights
+
+def share_apptest_runtime() -> None:
+    """
+    AppTest is built for one test at a time: every run installs a mock Runtime as the
+    process singleton, clears it when done and compiles the page with a fresh
+    ScriptCache. Run concurrently, one user's teardown pulls the runtime out from
+    under another user's script, and parallel compiles can crash CPython.
+    A real server has one runtime and one script cache for all sessions, so share
+    both here the same way.
+
+    This leans on private Streamlit internals, so it refuses to run on versions
+    outside TESTED_STREAMLIT rather than produce a misleading report.
+    """
+    import streamlit
+    from streamlit.runtime import Runtime
+    from streamlit.runtime.scriptrunner.script_cache import ScriptCache
+
+    version = tuple(int(x) for x in streamlit.__version__.split(".")[:2])
+    if version not in TESTED_STREAMLIT or not hasattr(Runtime, "_instance") or not hasattr(ScriptCache, "get_bytecode"):
+        tested = ", ".join(f"{a}.{b}" for a, b in sorted(TESTED_STREAMLIT))
+        raise RuntimeError(
+            f"load_test patches Streamlit internals and was checked against {tested}; "
+            f"found {streamlit.__version__}. Re-verify share_apptest_runtime and add it to TESTED_STREAMLIT."
+        )
+
+    state = {"runtime": None}
+    shared_cache = ScriptCache()
+    get_bytecode = ScriptCache.get_bytecode
+
+    def instance(cls):
+        if cls._instance is not None:
+            state["runtime"] = cls._instance
+        if state["runtime"] is None:
+            raise RuntimeError("Runtime hasn't been created!")
+        return state["runtime"]
+
+    def exists(cls):
+        return cls._instance is not None or state["runtime"] is not None
+
+    Runtime.instance = classmethod(instance)
+    Runtime.exists = classmethod(exists)
+    ScriptCache.get_bytecode = lambda self, script_path: get_bytecode(shared_cache, script_path)
+
+class LoadTest:
+    """
+    Drives the real page scripts with Streamlit's AppTest from N threads against a
+    copy of the DB, then checks the ledger against what the simulated users were told.
+    """
+
+    def __init__(self, users: list[tuple[str, str]], mix: dict[str, int], timeout: float = 120.0):
+        from streamlit.testing.v1 import AppTest  # imported lazily so --help works without streamlit
+
+        share_apptest_runtime()
+        self.AppTest = AppTest
+        self.users = users
+        self.mix = mix
+        self.timeout = timeout
+        self.latencies = defaultdict(list)
+        self.outcomes = defaultdict(lambda: defaultdict(int))
+        self.acked = []  # (customer_id, txn_id, signed_amount_paise)
+        self._lock = threading.Lock()
+
+    def _page(self, name: str, customer_id: str | None):
+        at = self.AppTest.from_file(os.path.join(PAGES_DIR, PAGES[name]), default_timeout=self.timeout)
+        if customer_id is not None:
+            at.session_state.is_logged_in = True
+            at.session_state.customer_id = customer_id
+        return at
+
+    def _record(self, name: str, started: float, outcome: str) -> None:
+        with self._lock:
+            self.latencies[name].append((time.perf_counter() - started) * 1000)
+            self.outcomes[name][outcome] += 1
+
+    def _login(self, username: str, password: str) -> str | None:
+        started = time.perf_counter()
+        at = self._page("login", None)
+        at.run()
+        at.text_input[0].input(username)
+        at.text_input[1].input(password)
+        at.button[0].click()
+        at.run()
+        ok = bool(at.success) and not at.exception
+        self._record("login", started, "exception" if at.exception else "ok" if ok else "rejected")
+        return at.session_state.customer_id if ok else None
+
+    def _post(self, name: str, customer_id: str, rng: random.Random) -> None:
+        amount = rng.choice([10, 50, 100, 250, 500, 1000])
+        started = time.perf_counter()
+        at = self._page(name, customer_id)
+        at.run()
+        at.text_input[0].input(str(amount))
+        at.text_input[1].input("load test")
+        at.button[0].click()
+        at.run()
+
+        if at.exception:
+            self._record(name, started, "exception")
+            return
+
+        match = next((TXN_ID_RE.search(str(i.value)) for i in at.info if TXN_ID_RE.search(str(i.value))), None)
+        if at.success and match:
+            sign = 1 if name == "deposit" else -1
+            with self._lock:
+                self.acked.append((customer_id, match.group(1), sign * to_paise(amount)))
+            self._record(name, started, "ok")
+        else:
+            self._record(name, started, "rejected")
+
+    def _view(self, name: str, customer_id: str) -> None:
+        started = time.perf_counter()
+        at = self._page(name, customer_id)
+        at.run()
+        self._record(name, started, "exception" if at.exception else "ok")
+
+    def _user(self, worker: int, actions: int, seed: int) -> None:
+        rng = random.Random(seed + worker)
+        username, password = self.users[worker % len(self.users)]
+        customer_id = self._login(username, password)
+        if customer_id is None:
+            return
+
+        names = list(self.mix)
+        weights = [self.mix[n] for n in names]
+        for _ in range(actions):
+            name = rng.choices(names, weights)[0]
+            if name in ("deposit", "withdraw"):
+                self._post(name, customer_id, rng)
+            elif name == "login":
+                self._login(username, password)
+            else:
+                self._view(name, customer_id)
+
+    def run(self, concurrency: int, actions: int, seed: int = 0) -> float:
+        threads = [
+            threading.Thread(target=self._user, args=(w, actions, seed), daemon=True)
+            for w in range(concurrency)
+        ]
+        started = time.perf_counter()
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        return time.perf_counter() - started
+
+def check_ledger(db_path: str, before: dict[str, pd.DataFrame], acked: list[tuple[str, str, int]]) -> list[str]:
+    """
+    Compares the DB after the run with what users were acknowledged:
+    every acked txn must exist as SUCCESS, balances must move by exactly the acked
+    amounts, and each customer's balance_after chain must be unbroken.
+    """
+    from utils.data_store import load_all_sheets
+
+    after = load_all_sheets(db_path)
+    problems = []
+
+    tx = after["transactions"].copy()
+    tx["txn_id"] = tx["txn_id"].astype(str)
+    tx["customer_id"] = tx["customer_id"].astype(str)
+    success = tx[tx["status"].astype(str).str.upper() == "SUCCESS"].set_index("txn_id")
+
+    lost = [txn_id for _, txn_id, _ in acked if txn_id not in success.index]
+    if lost:
+        problems.append(f"Lost updates: {len(lost)} acknowledged txns missing from ledger (e.g. {lost[:5]})")
+
+    start_bal = before["customers"].set_index(before["customers"]["customer_id"].astype(str))["current_balance"]
+    end_bal = after["customers"].set_index(after["customers"]["customer_id"].astype(str))["current_balance"]
+    delta = defaultdict(int)
+    for cust, _, amt in acked:
+        delta[cust] += amt
+
+    old_ids = set(before["transactions"]["txn_id"].astype(str))
+    new_tx = tx[~tx["txn_id"].isin(old_ids) & (tx["status"].astype(str).str.upper() == "SUCCESS")]
+
+    for cust in sorted(set(start_bal.index) | set(delta)):
+        expected = int(start_bal.get(cust, 0)) + delta[cust]
+        actual = int(end_bal.get(cust, 0))
+        if expected != actual:
+            problems.append(f"Balance mismatch for {cust}: expected {format_inr(expected)}, found {format_inr(actual)}")
+
+        running = int(start_bal.get(cust, 0))
+        rows = new_tx[new_tx["customer_id"] == cust].sort_values("txn_id")
+        for _, r in rows.iterrows():
+            running += int(r["amount"]) * (-1 if str(r["txn_type"]).upper() == "WITHDRAW" else 1)
+            if running != int(r["balance_after"]):
+                problems.append(f"Broken balance_after chain for {cust} at {r['txn_id']}")
+                break
+
+    return problems
+
+def report(test: LoadTest, elapsed: float, problems: list[str]) -> str:
+    lines = []
+    total = sum(len(v) for v in test.latencies.values())
+    lines.append(f"Requests: {total} in {elapsed:.1f}s • Throughput: {total / elapsed:.1f} req/s")
+    lines.append("")
+    lines.append(f"{'page':<10} {'count':>6} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}  outcomes")
+    for name in PAGES:
+        values = test.latencies.get(name)
+        if not values:
+            continue
+        p50, p95, p99 = np.percentile(values, [50, 95, 99])
+        outcomes = ", ".join(f"{k}={v}" for k, v in sorted(test.outcomes[name].items()))
+        lines.append(f"{name:<10} {len(values):>6} {p50:>9.1f} {p95:>9.1f} {p99:>9.1f}  {outcomes}")
+    lines.append("")
+    if problems:
+        lines.append("❌ Consistency problems:")
+        lines.extend(f"  - {p}" for p in problems)
+    else:
+        lines.append("✅ No lost updates or balance mismatches.")
+    return "\n".join(lines)
+
+def main():
+    parser = argparse.ArgumentParser(description="Concurrent load test for the Streamlit pages (runs on a copy of the DB).")
+    parser.add_argument("--users", type=int, default=10, help="Simulated concurrent users")
+    parser.add_argument("--actions", type=int, default=20, help="Actions per user after login")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help=f"Page weights (default: {DEFAULT_MIX})")
+    parser.add_argument("--credentials", default=DEFAULT_USERS, help="username:password,... to log in with")
+    parser.add_argument("--db", default=os.getenv("DB_EXCEL_PATH", "data/banking_db.xlsx"), help="DB to copy")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    from utils.data_store import load_all_sheets
+
+    # Never touch the real DB: pages read DB_EXCEL_PATH / ARCHIVE_DIR at run time
+    workdir = tempfile.mkdtemp(prefix="sbp_load_")
+    db_path = os.path.join(workdir, "banking_db.xlsx")
+    shutil.copyfile(args.db, db_path)
+    os.environ["DB_EXCEL_PATH"] = db_path
+    os.environ["ARCHIVE_DIR"] = os.path.join(workdir, "archive")
+
+    try:
+        users = [tuple(c.split(":", 1)) for c in args.credentials.split(",")]
+        before = load_all_sheets(db_path)
+
+        test = LoadTest(users, parse_weights(args.mix))
+        elapsed = test.run(args.users, args.actions, args.seed)
+        problems = check_ledger(db_path, before, test.acked)
+
+        print(report(test, elapsed, problems))
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+    sys.exit(1 if problems else 0)
+
+if __name__ == "__main__":
+    main()
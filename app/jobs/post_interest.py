@@ -0,0 +1,69 @@
+import os
+import sys
+import argparse
+from datetime import date
+from dotenv import load_dotenv
+
+# ✅ Make "app/" import root
+APP_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if APP_DIR not in sys.path:
+    sys.path.insert(0, APP_DIR)
+
+from utils.data_store import load_all_sheets, save_all_sheets, write_lock
+from utils.interest import post_month_end_interest
+from utils.archive import read_manifest
+from utils.money import format_inr
+
+load_dotenv()
+
+DB_EXCEL_PATH = os.getenv("DB_EXCEL_PATH", "data/banking_db.xlsx")
+ARCHIVE_DIR = os.getenv("ARCHIVE_DIR", "data/archive")
+
+def previous_month() -> str:
+    first = date.today().replace(day=1)
+    prev = date.fromordinal(first.toordinal() - 1)
+    return prev.strftime("%Y-%m")
+
+def main():
+    parser = argparse.ArgumentParser(description="Post month-end interest for all accounts.")
+    parser.add_argument("--month", default=previous_month(), help="YYYY-MM (default: previous month)")
+    args = parser.parse_args()
+
+    try:
+        month_start = date.fromisoformat(f"{args.month}-01")
+    except ValueError:
+        parser.error(f"--month must be YYYY-MM, got {args.month!r}")
+    args.month = month_start.strftime("%Y-%m")
+
+    # Only whole months: a partial run would be taken as "already credited" at month end
+    if month_start >= date.today().replace(day=1):
+        parser.error(f"{args.month} hasn't ended yet; interest can only be posted for past months.")
+
+    # Once a month is (partly) archived, its movements are a single BALANCE_FWD row and its
+    # INT-<month> rows may be gone from the hot sheet, so neither accrual nor the re-run check holds
+    cutoff = read_manifest(ARCHIVE_DIR)["cutoff"]
+    if cutoff is not None and month_start.isoformat() < cutoff:
+        parser.error(f"{args.month} is before the archive cutoff ({cutoff}); it can't be (re)posted.")
+
+    # Held from load to save, so postings the running app commits meanwhile wait instead of being overwritten
+    with write_lock(DB_EXCEL_PATH):
+        sheets = load_all_sheets(DB_EXCEL_PATH)
+        customers, transactions, posted = post_month_end_interest(
+            customers=sheets["customers"],
+            transactions=sheets["transactions"],
+            month=args.month
+        )
+
+        if posted.empty:
+            print(f"No interest to post for {args.month}.")
+            return
+
+        # One write for the whole batch
+        sheets["customers"] = customers
+        sheets["transactions"] = transactions
+        save_all_sheets(DB_EXCEL_PATH, sheets)
+
+    print(f"Posted interest for {args.month}: {len(posted)} accounts, total ₹ {format_inr(posted['amount'].sum())}")
+
+if __name__ == "__main__":
+    main()
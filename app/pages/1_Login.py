@@ -8,8 +8,8 @@ APP_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
 if APP_DIR not in sys.path:
     sys.path.insert(0, APP_DIR)
 
-from utils.data_store import load_all_sheets, save_all_sheets
-from utils.auth import authenticate_and_update_plain, unlock_user
+from utils.data_store import load_all_sheets, update_sheets
+from utils.auth import verify_login, record_login, unlock_user, CREDENTIALS_CHANGED
 
 load_dotenv()
 
@@ -32,17 +32,34 @@ with st.form("login_form", clear_on_submit=False):
 
 if submitted:
     try:
-        sheets = load_all_sheets(DB_EXCEL_PATH)
-        login_df = sheets["login_details"]
+        login_df = load_all_sheets(DB_EXCEL_PATH)["login_details"]
 
-        ok, msg, updated_login_df, cust_id = authenticate_and_update_plain(
-            login_df=login_df,
-            username=username,
-            password=password
-        )
+        # Second pass only if the stored password changed in between (e.g. a parallel login upgraded it)
+        for _ in range(2):
+            # Password check (slow KDF) runs outside the write lock
+            status, msg, credential, new_hash = verify_login(
+                login_df=login_df,
+                username=username,
+                password=password
+            )
+            ok, cust_id = False, None
+            if status not in ("ok", "wrong"):
+                break
 
-        sheets["login_details"] = updated_login_df
-        save_all_sheets(DB_EXCEL_PATH, sheets)
+            # ✅ Attempt count / lock / hash upgrade are decided on fresh data under the write lock
+            result = {}
+
+            def save_attempt(fresh):
+                ok, msg, fresh["login_details"], cust_id = record_login(
+                    fresh["login_details"], username, status, credential, new_hash
+                )
+                result.update(ok=ok, msg=msg, cust_id=cust_id, login_df=fresh["login_details"].copy())
+
+            update_sheets(DB_EXCEL_PATH, save_attempt)
+            ok, msg, cust_id = result["ok"], result["msg"], result["cust_id"]
+            if msg != CREDENTIALS_CHANGED:
+                break
+            login_df = result["login_df"]
 
         if ok:
             st.success(msg)
@@ -65,12 +82,13 @@ st.divider()
 st.subheader("🔓 Admin Unlock (Demo)")
 unlock_name = st.text_input("Unlock username", value=username if username else "")
 if st.button("Unlock Account"):
-    sheets = load_all_sheets(DB_EXCEL_PATH)
-    df = sheets["login_details"]
-    ok, df = unlock_user(df, unlock_name)
-    if ok:
-        sheets["login_details"] = df
-        save_all_sheets(DB_EXCEL_PATH, sheets)
+    result = {}
+
+    def do_unlock(fresh):
+        result["ok"], fresh["login_details"] = unlock_user(fresh["login_details"], unlock_name)
+
+    update_sheets(DB_EXCEL_PATH, do_unlock)
+    if result["ok"]:
         st.success(f"Unlocked: {unlock_name}")
     else:
         st.error("User not found.")
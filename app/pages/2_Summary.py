@@ -10,17 +10,24 @@ if APP_DIR not in sys.path:
 
 from utils.data_store import load_all_sheets
 from utils.session_guard import require_login
+from utils.money import format_inr, money_view
+from utils.change_feed import get_change_feed
 
 load_dotenv()
 
 BANK_NAME = os.getenv("BANK_NAME", "State Bank of Python")
 DB_EXCEL_PATH = os.getenv("DB_EXCEL_PATH", "data/banking_db.xlsx")
 LOGO_PATH = os.path.join("assets", "sbp_logo.png")  # as per your structure
+REFRESH_SEC = float(os.getenv("PAGE_REFRESH_SEC", "2"))
 
 require_login()
 
 customer_id = st.session_state.get("customer_id")
 
+# Read the version before loading, so a posting that lands mid-load just triggers one more reload
+feed = get_change_feed(DB_EXCEL_PATH)
+version = feed.version(customer_id)
+
 # Header with logo
 col1, col2 = st.columns([1, 3])
 with col1:
@@ -32,13 +39,21 @@ with col2:
     st.title("📋 Customer Summary")
     st.caption(f"{BANK_NAME} • Logged in Customer ID: **{customer_id}**")
 
-# Load data
-sheets = load_all_sheets(DB_EXCEL_PATH)
-customers = sheets["customers"]
-transactions = sheets["transactions"]
+# Load data (skipped on reruns while this customer's data is unchanged)
+cache = st.session_state.get("summary_cache")
+if not cache or cache["key"] != (customer_id, version):
+    sheets = load_all_sheets(DB_EXCEL_PATH)
+    customers = sheets["customers"]
+    transactions = sheets["transactions"]
+    cache = {
+        "key": (customer_id, version),
+        "cust": customers[customers["customer_id"].astype(str) == str(customer_id)],
+        "tx": transactions[transactions["customer_id"].astype(str) == str(customer_id)],
+    }
+    st.session_state.summary_cache = cache
 
 # Fetch customer row
-cust = customers[customers["customer_id"].astype(str) == str(customer_id)]
+cust = cache["cust"]
 if cust.empty:
     st.error("Customer not found in customers table.")
     st.stop()
@@ -46,13 +61,13 @@ if cust.empty:
 cust = cust.iloc[0].to_dict()
 
 # Balance
-balance = cust.get("current_balance", 0.0)
+balance = cust.get("current_balance", 0)
 
 # KPI cards
 k1, k2, k3 = st.columns(3)
 k1.metric("Account No", cust.get("account_no", "NA"))
 k2.metric("Account Type", cust.get("account_type", "NA"))
-k3.metric("Current Balance (₹)", f"{float(balance):,.2f}")
+k3.metric("Current Balance (₹)", format_inr(balance))
 
 st.divider()
 
@@ -82,7 +97,7 @@ st.divider()
 # Recent transactions preview
 st.subheader("🧾 Recent Transactions (Preview)")
 
-tx = transactions[transactions["customer_id"].astype(str) == str(customer_id)].copy()
+tx = cache["tx"].copy()
 
 if tx.empty:
     st.info("No transactions found for this customer.")
@@ -93,7 +108,7 @@ else:
         tx = tx.sort_values(by="txn_ts", ascending=False)
 
     show_cols = [c for c in ["txn_ts", "txn_type", "amount", "balance_after", "status", "remarks"] if c in tx.columns]
-    st.dataframe(tx[show_cols].head(10), use_container_width=True)
+    st.dataframe(money_view(tx[show_cols].head(10)), use_container_width=True)
 
 st.divider()
 
@@ -103,3 +118,12 @@ if st.button("🚪 Logout"):
     st.session_state.customer_id = None
     st.success("Logged out successfully.")
     st.info("Go back to **1_Login** page to login again.")
+
+# Live refresh: a cheap version check, full rerun only when this customer changed
+if REFRESH_SEC > 0:
+    @st.fragment(run_every=REFRESH_SEC)
+    def refresh_on_change():
+        if feed.version(customer_id) != version:
+            st.rerun()
+
+    refresh_on_change()
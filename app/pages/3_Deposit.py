@@ -8,10 +8,11 @@ APP_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
 if APP_DIR not in sys.path:
     sys.path.insert(0, APP_DIR)
 
-from utils.data_store import load_all_sheets, save_all_sheets
+from utils.data_store import load_all_sheets
 from utils.session_guard import require_login
 from utils.validators import validate_amount
-from utils.txn_helpers import add_transaction_row
+from utils.money import format_inr
+from utils.posting_queue import post_transaction
 
 load_dotenv()
 
@@ -27,7 +28,6 @@ st.caption(f"{BANK_NAME} • Customer ID: **{customer_id}**")
 # Load sheets
 sheets = load_all_sheets(DB_EXCEL_PATH)
 customers = sheets["customers"]
-transactions = sheets["transactions"]
 
 # Get customer
 mask = customers["customer_id"].astype(str) == str(customer_id)
@@ -39,9 +39,9 @@ idx = customers[mask].index[0]
 cust = customers.loc[idx].to_dict()
 
 account_no = cust.get("account_no", "")
-current_balance = float(cust.get("current_balance", 0.0))
+current_balance = int(cust.get("current_balance", 0))
 
-st.info(f"💰 Current Balance: ₹ {current_balance:,.2f}")
+st.info(f"💰 Current Balance: ₹ {format_inr(current_balance)}")
 
 st.divider()
 
@@ -56,32 +56,27 @@ if submitted:
         st.error(msg)
         st.stop()
 
-    new_balance = current_balance + amt
-
-    # Update customer balance
-    customers.loc[idx, "current_balance"] = new_balance
-
-    # Add transaction row
-    transactions = add_transaction_row(
-        transactions_df=transactions,
-        customer_id=str(customer_id),
-        account_no=str(account_no),
-        txn_type="DEPOSIT",
-        amount=float(amt),
-        balance_after=float(new_balance),
-        channel="ONLINE",
-        reference="DEPOSIT",
-        status="SUCCESS",
-        remarks=str(remarks).strip()
-    )
-
-    # Save back
-    sheets["customers"] = customers
-    sheets["transactions"] = transactions
-    save_all_sheets(DB_EXCEL_PATH, sheets)
-
-    st.success(f"✅ Deposit successful! Deposited ₹ {amt:,.2f}")
+    # Post via the group-commit queue (balance is applied there)
+    try:
+        ok, msg, txn_id, new_balance = post_transaction(
+            DB_EXCEL_PATH,
+            customer_id=str(customer_id),
+            txn_type="DEPOSIT",
+            amount=amt,
+            channel="ONLINE",
+            reference="DEPOSIT",
+            remarks=str(remarks).strip()
+        )
+    except Exception:
+        # Timed out or the batch failed: it may still have been (or yet be) committed
+        st.warning("⚠️ Deposit status unknown. Please check **5_Mini_Statement** before trying again.")
+        st.stop()
+    if not ok:
+        st.error(f"❌ {msg}")
+        st.stop()
+
+    st.success(f"✅ Deposit successful! Deposited ₹ {format_inr(amt)}")
     st.balloons()
-    st.info(f"Updated Balance: ₹ {new_balance:,.2f}")
+    st.info(f"Updated Balance: ₹ {format_inr(new_balance)} • Txn ID: {txn_id}")
 
     st.caption("Go to **2_Summary** or **5_Mini_Statement** to verify the transaction.")
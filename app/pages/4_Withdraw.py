@@ -8,15 +8,18 @@ APP_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
 if APP_DIR not in sys.path:
     sys.path.insert(0, APP_DIR)
 
-from utils.data_store import load_all_sheets, save_all_sheets
+from utils.data_store import load_all_sheets
 from utils.session_guard import require_login
 from utils.validators import validate_amount
-from utils.txn_helpers import add_transaction_row
+from utils.money import format_inr
+from utils.posting_queue import post_transaction
+from utils.velocity import get_velocity_tracker, ts_seconds
 
 load_dotenv()
 
 BANK_NAME = os.getenv("BANK_NAME", "State Bank of Python")
 DB_EXCEL_PATH = os.getenv("DB_EXCEL_PATH", "data/banking_db.xlsx")
+CHANNEL = "ONLINE"
 
 require_login()
 customer_id = st.session_state.get("customer_id")
@@ -39,9 +42,9 @@ idx = customers[mask].index[0]
 cust = customers.loc[idx].to_dict()
 
 account_no = cust.get("account_no", "")
-current_balance = float(cust.get("current_balance", 0.0))
+current_balance = int(cust.get("current_balance", 0))
 
-st.info(f"💰 Current Balance: ₹ {current_balance:,.2f}")
+st.info(f"💰 Current Balance: ₹ {format_inr(current_balance)}")
 
 st.divider()
 
@@ -58,34 +61,52 @@ if submitted:
 
     # ✅ Balance check
     if amt > current_balance:
-        st.error(f"❌ Insufficient balance. You can withdraw up to ₹ {current_balance:,.2f}")
+        st.error(f"❌ Insufficient balance. You can withdraw up to ₹ {format_inr(current_balance)}")
         st.stop()
 
-    new_balance = current_balance - amt
-
-    # Update customer balance
-    customers.loc[idx, "current_balance"] = new_balance
-
-    # Add transaction row
-    transactions = add_transaction_row(
-        transactions_df=transactions,
-        customer_id=str(customer_id),
-        account_no=str(account_no),
-        txn_type="WITHDRAW",
-        amount=float(amt),
-        balance_after=float(new_balance),
-        channel="ONLINE",
-        reference="WITHDRAW",
-        status="SUCCESS",
-        remarks=str(remarks).strip()
-    )
-
-    # Save back
-    sheets["customers"] = customers
-    sheets["transactions"] = transactions
-    save_all_sheets(DB_EXCEL_PATH, sheets)
-
-    st.success(f"✅ Withdrawal successful! Withdrawn ₹ {amt:,.2f}")
-    st.info(f"Updated Balance: ₹ {new_balance:,.2f}")
+    # ✅ Velocity limits (hourly/daily amount & count), reserved until the posting outcome is known
+    tracker = get_velocity_tracker(transactions)
+    attempt_ts = ts_seconds()
+    ok, reason = tracker.check_and_record(account_no, CHANNEL, amt, attempt_ts)
+    if not ok:
+        try:
+            post_transaction(
+                DB_EXCEL_PATH,
+                customer_id=str(customer_id),
+                txn_type="WITHDRAW",
+                amount=amt,
+                channel=CHANNEL,
+                reference="WITHDRAW",
+                status="FAILED",
+                remarks=reason
+            )
+        except Exception:
+            pass  # only the audit row for a rejected attempt; the user still gets the reason
+        st.error(f"❌ {reason}")
+        st.stop()
+
+    # Post via the group-commit queue (balance is re-checked there)
+    try:
+        ok, msg, txn_id, new_balance = post_transaction(
+            DB_EXCEL_PATH,
+            customer_id=str(customer_id),
+            txn_type="WITHDRAW",
+            amount=amt,
+            channel=CHANNEL,
+            reference="WITHDRAW",
+            remarks=str(remarks).strip()
+        )
+    except Exception:
+        # Timed out or the batch failed: it may still have been (or yet be) committed,
+        # so the velocity reservation is kept
+        st.warning("⚠️ Withdrawal status unknown. Please check **5_Mini_Statement** before trying again.")
+        st.stop()
+    if not ok:
+        tracker.release(account_no, CHANNEL, amt, attempt_ts)
+        st.error(f"❌ {msg}")
+        st.stop()
+
+    st.success(f"✅ Withdrawal successful! Withdrawn ₹ {format_inr(amt)}")
+    st.info(f"Updated Balance: ₹ {format_inr(new_balance)} • Txn ID: {txn_id}")
 
     st.caption("Go to **2_Summary** or **5_Mini_Statement** to verify the transaction.")
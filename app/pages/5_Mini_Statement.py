@@ -11,12 +11,17 @@ if APP_DIR not in sys.path:
 from utils.data_store import load_all_sheets
 from utils.session_guard import require_login
 from utils.pdf_export import build_mini_statement_pdf
+from utils.archive import customer_history
+from utils.money import money_view
+from utils.change_feed import get_change_feed
 
 load_dotenv()
 
 BANK_NAME = os.getenv("BANK_NAME", "State Bank of Python")
 DB_EXCEL_PATH = os.getenv("DB_EXCEL_PATH", "data/banking_db.xlsx")
 LOGO_PATH = os.path.join("assets", "sbp_logo.png")
+ARCHIVE_DIR = os.getenv("ARCHIVE_DIR", "data/archive")
+REFRESH_SEC = float(os.getenv("PAGE_REFRESH_SEC", "2"))
 
 require_login()
 customer_id = st.session_state.get("customer_id")
@@ -24,13 +29,23 @@ customer_id = st.session_state.get("customer_id")
 st.title("🧾 Mini Statement")
 st.caption(f"{BANK_NAME} • Customer ID: **{customer_id}**")
 
-# Load data
-sheets = load_all_sheets(DB_EXCEL_PATH)
-customers = sheets["customers"]
-transactions = sheets["transactions"]
+# Load data (skipped on reruns, e.g. changing N, while this customer's data is unchanged)
+feed = get_change_feed(DB_EXCEL_PATH)
+version = feed.version(customer_id)
+cache = st.session_state.get("statement_cache")
+if not cache or cache["key"] != (customer_id, version):
+    sheets = load_all_sheets(DB_EXCEL_PATH)
+    customers = sheets["customers"]
+    transactions = sheets["transactions"]
+    cache = {
+        "key": (customer_id, version),
+        "cust": customers[customers["customer_id"].astype(str) == str(customer_id)],
+        "tx": transactions[transactions["customer_id"].astype(str) == str(customer_id)],
+    }
+    st.session_state.statement_cache = cache
 
 # Fetch customer
-cust_df = customers[customers["customer_id"].astype(str) == str(customer_id)]
+cust_df = cache["cust"]
 if cust_df.empty:
     st.error("Customer not found in customers table.")
     st.stop()
@@ -48,8 +63,8 @@ with col2:
     st.write("")
     show_all = st.checkbox("Show all transactions", value=False)
 
-# Filter transactions
-tx = transactions[transactions["customer_id"].astype(str) == str(customer_id)].copy()
+# Filter transactions (archive is read only if the hot set can't cover the request)
+tx = customer_history(cache["tx"], customer_id, ARCHIVE_DIR, min_rows=int(n), all_history=show_all)
 
 if tx.empty:
     st.info("No transactions found for this customer.")
@@ -64,7 +79,7 @@ tx_view = tx if show_all else tx.head(int(n))
 
 # Display mini statement
 show_cols = [c for c in ["txn_ts", "txn_id", "txn_type", "amount", "balance_after", "status", "remarks"] if c in tx_view.columns]
-st.dataframe(tx_view[show_cols], use_container_width=True)
+st.dataframe(money_view(tx_view[show_cols]), use_container_width=True)
 
 st.divider()
 
@@ -85,4 +100,13 @@ st.download_button(
     mime="application/pdf"
 )
 
-st.caption("Tip: Deposit/Withdraw and come back here to see updated entries.")
+st.caption("New deposits/withdrawals show up here automatically.")
+
+# Live refresh: a cheap version check, full rerun only when this customer changed
+if REFRESH_SEC > 0:
+    @st.fragment(run_every=REFRESH_SEC)
+    def refresh_on_change():
+        if feed.version(customer_id) != version:
+            st.rerun()
+
+    refresh_on_change()
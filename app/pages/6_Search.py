@@ -0,0 +1,87 @@
+import os
+import sys
+import streamlit as st
+from dotenv import load_dotenv
+
+# ✅ Make "app/" import root
+APP_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if APP_DIR not in sys.path:
+    sys.path.insert(0, APP_DIR)
+
+from utils.data_store import load_all_sheets
+from utils.session_guard import require_login
+from utils.txn_search import get_txn_index, search_transactions
+from utils.money import money_view, to_paise, MAX_AMOUNT_PAISE, PAISE_PER_RUPEE
+
+load_dotenv()
+
+BANK_NAME = os.getenv("BANK_NAME", "State Bank of Python")
+DB_EXCEL_PATH = os.getenv("DB_EXCEL_PATH", "data/banking_db.xlsx")
+ARCHIVE_DIR = os.getenv("ARCHIVE_DIR", "data/archive")
+MAX_AMOUNT = MAX_AMOUNT_PAISE / PAISE_PER_RUPEE
+
+require_login()
+customer_id = st.session_state.get("customer_id")
+
+st.title("🔎 Search Transactions")
+st.caption(f"{BANK_NAME} • Customer ID: **{customer_id}**")
+
+# Load data
+sheets = load_all_sheets(DB_EXCEL_PATH)
+transactions = sheets["transactions"]
+index = get_txn_index(transactions, customer_id)
+
+if index.rows.empty:
+    st.info("No transactions found for this customer.")
+    st.stop()
+
+# Filters
+with st.form("search_form"):
+    c1, c2, c3 = st.columns(3)
+    with c1:
+        date_from = st.date_input("From date", value=None)
+        date_to = st.date_input("To date", value=None)
+    with c2:
+        types = st.multiselect("Type", sorted(index.by_type.keys()))
+        text = st.text_input("Reference / remarks", placeholder="e.g., ATM, salary, T0000002")
+    with c3:
+        amount_min = st.number_input("Min amount (₹)", min_value=0.0, max_value=MAX_AMOUNT, value=None)
+        amount_max = st.number_input("Max amount (₹)", min_value=0.0, max_value=MAX_AMOUNT, value=None)
+    page_size = st.selectbox("Rows per page", [10, 20, 50, 100], index=1)
+    st.form_submit_button("Search", type="primary")
+
+query = dict(
+    date_from=date_from,
+    date_to=date_to,
+    types=types,
+    amount_min=None if amount_min is None else to_paise(amount_min),
+    amount_max=None if amount_max is None else to_paise(amount_max),
+    text=text,
+)
+
+# Keyset pagination: keep a stack of cursors, reset when the query changes
+query_key = (str(query), page_size)
+if st.session_state.get("search_query_key") != query_key:
+    st.session_state.search_query_key = query_key
+    st.session_state.search_cursors = [None]
+
+cursors = st.session_state.search_cursors
+page, next_cursor, total, used_archive = search_transactions(
+    transactions, customer_id, ARCHIVE_DIR,
+    after_txn_id=cursors[-1], page_size=int(page_size), **query
+)
+
+st.write(f"**{total}** matching transactions • Page {len(cursors)}" + (" • incl. archived history" if used_archive else ""))
+
+show_cols = [c for c in ["txn_ts", "txn_id", "txn_type", "amount", "balance_after", "channel", "reference", "status", "remarks"] if c in page.columns]
+st.dataframe(money_view(page[show_cols]), use_container_width=True, hide_index=True)
+
+prev_col, next_col = st.columns(2)
+with prev_col:
+    if st.button("⬅️ Newer", disabled=len(cursors) == 1):
+        cursors.pop()
+        st.rerun()
+with next_col:
+    if st.button("Older ➡️", disabled=next_cursor is None):
+        cursors.append(next_cursor)
+        st.rerun()
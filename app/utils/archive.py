@@ -0,0 +1,194 @@
+import os
+import json
+from pathlib import Path
+import numpy as np
+import pandas as pd
+
+from utils.money import money_to_paise, money_to_rupees
+from utils.txn_helpers import add_transaction_rows, signed_amounts
+
+BALANCE_FWD = "BALANCE_FWD"
+MANIFEST = "manifest.json"
+ID_COLUMNS = {"txn_id": str, "customer_id": str, "account_no": str}
+
+def read_manifest(archive_dir: str) -> dict:
+    """
+    Returns: {"cutoff": "YYYY-MM-DD" or None, "partitions": {"YYYY-MM": [file names]}}
+    """
+    path = Path(archive_dir) / MANIFEST
+    if not path.exists():
+        return {"cutoff": None, "partitions": {}}
+    return json.loads(path.read_text(encoding="utf-8"))
+
+def _write_manifest(archive_dir: str, manifest: dict) -> None:
+    path = Path(archive_dir) / MANIFEST
+    tmp = path.with_name(MANIFEST + ".tmp")
+    tmp.write_text(json.dumps(manifest, indent=2, sort_keys=True), encoding="utf-8")
+    os.replace(tmp, path)
+
+def _write_partition(path: Path, rows: pd.DataFrame) -> None:
+    # Partitions are write-once: never overwrite an existing file.
+    # Written under a temp name and renamed, so a crash can't leave a half file behind.
+    if path.exists():
+        return
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "wb") as fh:
+        money_to_rupees(rows, "transactions").to_csv(fh, index=False, compression={"method": "gzip"})
+        fh.flush()
+        os.fsync(fh.fileno())
+    os.chmod(tmp, 0o444)
+    os.replace(tmp, path)
+
+def _archived_ids(archive_dir: str, manifest: dict, months) -> set[str]:
+    """
+    txn_ids already in the manifest's partitions for `months`.
+    """
+    ids = set()
+    for month in months:
+        for name in manifest["partitions"].get(month, []):
+            df = pd.read_csv(Path(archive_dir) / name, usecols=["txn_id"], dtype=str, compression="gzip")
+            ids.update(df["txn_id"])
+    return ids
+
+def archive_old_transactions(
+    sheets: dict[str, pd.DataFrame],
+    cutoff: str,
+    archive_dir: str
+) -> tuple[dict[str, pd.DataFrame], dict]:
+    """
+    Moves transactions dated before `cutoff` ("YYYY-MM-DD") into gzip CSV partitions,
+    one per month per run, and replaces them in the hot sheet with one BALANCE_FWD row
+    per account carrying the archived net balance.
+
+    The manifest is written before the caller saves the hot sheet. If that save never
+    happens, a rerun finds the rows already archived: they aren't written to a second
+    partition, just dropped from the hot sheet and carried forward.
+    Returns: (updated_sheets, summary)
+    """
+    transactions = sheets["transactions"]
+    ts = transactions["txn_ts"].astype(str)
+    old = (ts < cutoff).to_numpy()
+    summary = {"cutoff": cutoff, "archived_rows": int(old.sum()), "partitions": []}
+    if not old.any():
+        return sheets, summary
+
+    archive_path = Path(archive_dir)
+    archive_path.mkdir(parents=True, exist_ok=True)
+    manifest = read_manifest(archive_dir)
+
+    cold = transactions[old].copy()
+    cold["txn_ts"] = cold["txn_ts"].astype(str)
+    months = cold["txn_ts"].str[:7]
+    done = _archived_ids(archive_dir, manifest, months.unique())
+    fresh = ~cold["txn_id"].astype(str).isin(done)
+    for month, rows in cold[fresh].groupby(months[fresh], sort=True):
+        name = f"transactions_{month}_{cutoff}.csv.gz"
+        _write_partition(archive_path / name, rows)
+        files = manifest["partitions"].setdefault(month, [])
+        if name not in files:
+            files.append(name)
+        summary["partitions"].append(name)
+
+    # Carry forward what the archived rows add up to, per account
+    net = pd.Series(signed_amounts(cold), index=cold.index)
+    carried = net.groupby([cold["customer_id"].astype(str), cold["account_no"].astype(str)]).sum()
+    fwd = pd.DataFrame({
+        "customer_id": carried.index.get_level_values(0),
+        "account_no": carried.index.get_level_values(1),
+        "txn_ts": f"{cutoff} 00:00:00",
+        "txn_type": BALANCE_FWD,
+        "amount": carried.to_numpy(dtype=np.int64),
+        "balance_after": carried.to_numpy(dtype=np.int64),
+        "channel": "SYSTEM",
+        "reference": BALANCE_FWD,
+        "status": "SUCCESS",
+        "remarks": f"Balance brought forward (history before {cutoff} archived)",
+    })
+
+    # New ids come after the current max, so next_txn_id keeps working on the hot set
+    hot = add_transaction_rows(transactions, fwd)
+    keep = np.r_[~old, np.ones(len(fwd), dtype=bool)]
+    sheets["transactions"] = hot[keep].reset_index(drop=True)
+
+    manifest["cutoff"] = max(cutoff, manifest["cutoff"] or cutoff)
+    _write_manifest(archive_dir, manifest)
+    return sheets, summary
+
+def needs_archive(archive_dir: str, date_from=None) -> bool:
+    """
+    True if a range starting at `date_from` (None = all history) reaches archived data.
+    """
+    cutoff = read_manifest(archive_dir)["cutoff"]
+    if cutoff is None:
+        return False
+    return date_from is None or str(date_from) < cutoff
+
+def load_archived(
+    archive_dir: str,
+    customer_id: str,
+    date_from=None,
+    date_to=None,
+    limit: int | None = None
+) -> pd.DataFrame:
+    """
+    Reads only the monthly partitions overlapping [date_from, date_to] and returns
+    that customer's archived rows. With `limit`, months are read newest first and
+    reading stops once at least `limit` real (non BALANCE_FWD) rows are found.
+    """
+    manifest = read_manifest(archive_dir)
+    lo = None if date_from is None else str(date_from)[:7]
+    hi = None if date_to is None else str(date_to)[:7]
+
+    frames, found = [], 0
+    for month, files in sorted(manifest["partitions"].items(), reverse=True):
+        if (lo is not None and month < lo) or (hi is not None and month > hi):
+            continue
+        for name in files:
+            df = pd.read_csv(Path(archive_dir) / name, dtype=ID_COLUMNS, compression="gzip")
+            rows = money_to_paise(df[df["customer_id"] == str(customer_id)].copy(), "transactions")
+            frames.append(rows)
+            found += int((rows["txn_type"].astype(str) != BALANCE_FWD).sum())
+        if limit is not None and found >= limit:
+            break
+
+    if not frames:
+        return pd.DataFrame(columns=list(ID_COLUMNS))
+    return pd.concat(frames[::-1], ignore_index=True)
+
+def customer_history(
+    transactions_df: pd.DataFrame,
+    customer_id: str,
+    archive_dir: str,
+    date_from=None,
+    min_rows: int = 0,
+    all_history: bool = False
+) -> pd.DataFrame:
+    """
+    A customer's transactions from the hot sheet, falling through to the archive only
+    when the request reaches before the archive cutoff (`all_history`, or `date_from`
+    earlier than the cutoff) or the hot set has fewer than `min_rows`.
+    Archived rows replace the BALANCE_FWD row they were summarised into.
+    Customers without a BALANCE_FWD row have no archived history, so never touch it.
+    """
+    tx = transactions_df[transactions_df["customer_id"].astype(str) == str(customer_id)]
+    is_fwd = tx["txn_type"].astype(str) == BALANCE_FWD
+    real = tx[~is_fwd]
+    if not is_fwd.any():
+        return tx.copy()
+
+    if all_history:
+        date_from = None
+    reaches_back = (all_history or date_from is not None) and needs_archive(archive_dir, date_from)
+    too_short = min_rows > len(real) and needs_archive(archive_dir)
+    if not (reaches_back or too_short):
+        return tx.copy()
+
+    # Just topping up a short "last N": only read back as many months as that takes
+    limit = None if reaches_back else min_rows - len(real)
+    cold = load_archived(archive_dir, customer_id, date_from=date_from, limit=limit)
+    if cold.empty:
+        return tx.copy()
+    cold = cold[cold["txn_type"].astype(str) != BALANCE_FWD]
+    # Rows archived by a run whose hot-sheet save didn't happen are still in the hot set
+    real = real[~real["txn_id"].astype(str).isin(cold["txn_id"])]
+    return pd.concat([cold, real], ignore_index=True)
@@ -1,31 +1,34 @@
 from datetime import datetime
+import hmac
 import pandas as pd
 
+from utils.passwords import is_hashed, needs_rehash, verify_password, hash_password_pooled
+
 MAX_ATTEMPTS = 3
+CREDENTIALS_CHANGED = "Your login details just changed. Please try again."
 
 def now_str() -> str:
     return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
 def _ensure_columns(login_df: pd.DataFrame) -> pd.DataFrame:
     """
-    Ensure required columns exist. Supports either 'password' or legacy 'password_hash' as plain password.
+    Ensure required columns exist.
+    'password_hash' holds the salted KDF hash. Legacy rows may still have a plain
+    'password', or a plain value in 'password_hash'; both are upgraded on next login.
     """
     if "username" not in login_df.columns:
         login_df["username"] = ""
 
-    # ✅ prefer password, fallback to password_hash (treated as plain)
-    if "password" not in login_df.columns:
-        if "password_hash" in login_df.columns:
-            login_df["password"] = login_df["password_hash"].astype(str)
-        else:
-            login_df["password"] = ""
+    # ✅ text columns as clean strings (Excel gives NaN for blanks)
+    for col in ["password", "password_hash", "locked_at", "last_login_at"]:
+        if col not in login_df.columns:
+            login_df[col] = ""
+        login_df[col] = login_df[col].fillna("").astype(str)
 
     defaults = {
         "customer_id": "",
         "is_locked": 0,
-        "failed_attempts": 0,
-        "locked_at": "",
-        "last_login_at": ""
+        "failed_attempts": 0
     }
     for col, default in defaults.items():
         if col not in login_df.columns:
@@ -33,14 +36,33 @@ def _ensure_columns(login_df: pd.DataFrame) -> pd.DataFrame:
 
     return login_df
 
-def authenticate_and_update_plain(
+def _check_stored(login_df: pd.DataFrame, idx, password: str) -> bool:
+    stored_hash = login_df.loc[idx, "password_hash"].strip()
+    if is_hashed(stored_hash):
+        return verify_password(password, stored_hash)
+
+    # Legacy plain text: 'password', or a plain value left in 'password_hash'
+    stored_plain = login_df.loc[idx, "password"].strip() or stored_hash
+    return bool(stored_plain) and hmac.compare_digest(password.encode(), stored_plain.encode())
+
+def _find_user(login_df: pd.DataFrame, username: str):
+    mask = login_df["username"].astype(str).str.lower() == username.lower()
+    return login_df[mask].index[0] if mask.any() else None
+
+def _credential(login_df: pd.DataFrame, idx) -> tuple[str, str]:
+    return login_df.loc[idx, "password"], login_df.loc[idx, "password_hash"]
+
+def verify_login(
     login_df: pd.DataFrame,
     username: str,
     password: str
-) -> tuple[bool, str, pd.DataFrame, str | None]:
+) -> tuple[str, str, tuple[str, str] | None, str | None]:
     """
-    Plain-text authentication.
-    Returns: (success, message, updated_login_df, customer_id_if_success)
+    Step 1 of a login: checks the password against a snapshot of the login sheet.
+    Runs the KDF, so call it before taking write_lock. Nothing is changed here.
+    Returns: (status, message, credential_checked, upgraded_hash_or_None)
+    status is "ok", "wrong", "locked", "not_found" or "invalid"; only "ok" and "wrong"
+    need record_login().
     """
     username = (username or "").strip()
     password = (password or "").strip()
@@ -48,23 +70,54 @@ def authenticate_and_update_plain(
     login_df = _ensure_columns(login_df)
 
     if not username or not password:
-        return False, "Please enter username and password.", login_df, None
+        return "invalid", "Please enter username and password.", None, None
 
     # Find user
-    mask = login_df["username"].astype(str).str.lower() == username.lower()
-    if not mask.any():
-        return False, "User not found.", login_df, None
-
-    idx = login_df[mask].index[0]
+    idx = _find_user(login_df, username)
+    if idx is None:
+        return "not_found", "User not found.", None, None
 
     # Check lock
+    if int(login_df.loc[idx, "is_locked"]) == 1:
+        return "locked", "Account is locked. Please contact admin to unlock.", None, None
+
+    credential = _credential(login_df, idx)
+    if not _check_stored(login_df, idx, password):
+        return "wrong", "Wrong password ❌", credential, None
+
+    new_hash = hash_password_pooled(password) if needs_rehash(credential[1]) else None
+    return "ok", "Login successful ✅", credential, new_hash
+
+def record_login(
+    login_df: pd.DataFrame,
+    username: str,
+    status: str,
+    credential: tuple[str, str],
+    new_hash: str | None = None
+) -> tuple[bool, str, pd.DataFrame, str | None]:
+    """
+    Step 2: applies a verify_login() result to a freshly loaded login sheet (inside
+    update_sheets), so attempt counts and locks are decided on current data:
+    concurrent wrong attempts each count, and a stale read can't undo an unlock.
+    Returns: (success, message, updated_login_df, customer_id_if_success)
+    """
+    login_df = _ensure_columns(login_df)
+    idx = _find_user(login_df, (username or "").strip())
+    if idx is None:
+        return False, "User not found.", login_df, None
+
     if int(login_df.loc[idx, "is_locked"]) == 1:
         return False, "Account is locked. Please contact admin to unlock.", login_df, None
 
-    stored_password = str(login_df.loc[idx, "password"]).strip()
+    # Password changed since it was checked: don't count or upgrade against the new one
+    if _credential(login_df, idx) != tuple(credential):
+        return False, CREDENTIALS_CHANGED, login_df, None
 
     # ✅ Correct password
-    if password == stored_password:
+    if status == "ok":
+        if new_hash:
+            login_df.loc[idx, "password_hash"] = new_hash
+            login_df.loc[idx, "password"] = ""
         login_df.loc[idx, "failed_attempts"] = 0
         login_df.loc[idx, "last_login_at"] = now_str()
         return True, "Login successful ✅", login_df, str(login_df.loc[idx, "customer_id"])
@@ -0,0 +1,96 @@
+import os
+import threading
+from contextlib import contextmanager
+
+def file_signature(st: os.stat_result) -> tuple[int, int]:
+    # save_all_sheets swaps in a new file, so the inode changes even within one mtime tick
+    return st.st_ino, st.st_mtime_ns
+
+class ChangeFeed:
+    """
+    Per-customer change versions for one DB file.
+
+    Every posting bumps the versions of the customers it touched to a new value of a
+    single sequence, so versions only ever go up. Pages keep the version they rendered
+    and compare it to version() (a dict lookup plus an os.stat) to decide whether
+    anything needs reloading.
+
+    Writes from other processes (post_interest, archive_transactions) don't go
+    through here; they are spotted by the file changing underneath us, and since we
+    can't tell whose data they touched, every customer's version moves.
+    """
+
+    def __init__(self, excel_path: str):
+        self.excel_path = excel_path
+        self._seq = 0
+        self._floor = 0  # version every customer has at least (after an outside write)
+        self._versions: dict[str, int] = {}
+        self._writers = 0  # in-process writes in flight; the file changing then is ours
+        self._file_sig = self._stat()
+        self._cond = threading.Condition()
+
+    def _stat(self) -> tuple[int, int] | None:
+        try:
+            return file_signature(os.stat(self.excel_path))
+        except FileNotFoundError:
+            return None
+
+    def _sync_with_file(self) -> None:
+        # caller holds self._cond
+        if self._writers:
+            return
+        sig = self._stat()
+        if sig != self._file_sig:
+            self._file_sig = sig
+            self._seq += 1
+            self._floor = self._seq
+            self._cond.notify_all()
+
+    @contextmanager
+    def writing(self):
+        """
+        Wraps an in-process load/save (under write_lock). An outside write we hadn't
+        noticed yet is counted first; while it runs, readers don't mistake our own
+        save for an outside one.
+        """
+        with self._cond:
+            self._sync_with_file()
+            self._writers += 1
+        try:
+            yield self
+        finally:
+            with self._cond:
+                self._writers -= 1
+
+    def record_write(self, customer_ids, written_sig: tuple[int, int]) -> int:
+        """
+        Bumps `customer_ids` after a save inside writing(), and adopts exactly the file
+        that save wrote (its signature, as returned by save_all_sheets). Anything
+        written over it afterwards still counts as an outside write.
+        Returns the new version.
+        """
+        with self._cond:
+            self._seq += 1
+            for cid in {str(c) for c in customer_ids}:
+                self._versions[cid] = self._seq
+            self._file_sig = written_sig
+            self._cond.notify_all()
+            return self._seq
+
+    def version(self, customer_id: str) -> int:
+        with self._cond:
+            self._sync_with_file()
+            return max(self._versions.get(str(customer_id), 0), self._floor)
+
+_feeds: dict[str, ChangeFeed] = {}
+_feeds_lock = threading.Lock()
+
+def get_change_feed(excel_path: str) -> ChangeFeed:
+    """
+    One feed per DB file for the whole process.
+    """
+    key = os.path.abspath(excel_path)
+    with _feeds_lock:
+        if key not in _feeds:
+            _feeds[key] = ChangeFeed(key)
+        return _feeds[key]
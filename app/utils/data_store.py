@@ -1,22 +1,110 @@
+import os
+import tempfile
+import threading
+from contextlib import contextmanager
 import pandas as pd
 from pathlib import Path
 
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+from utils.money import money_to_paise, money_to_rupees
+from utils.change_feed import get_change_feed, file_signature
+
 SHEETS = ["login_details", "customers", "transactions"]
 
+_write_locks: dict[str, threading.Lock] = {}
+_write_locks_guard = threading.Lock()
+
 def load_all_sheets(excel_path: str) -> dict[str, pd.DataFrame]:
+    """
+    Money columns come back as int64 paise (see utils.money).
+    """
     excel_path = Path(excel_path)
     if not excel_path.exists():
         raise FileNotFoundError(f"Excel DB not found: {excel_path}")
 
     data = {}
     for s in SHEETS:
-        data[s] = pd.read_excel(excel_path, sheet_name=s, engine="openpyxl")
+        data[s] = money_to_paise(pd.read_excel(excel_path, sheet_name=s, engine="openpyxl"), s)
     return data
 
-def save_all_sheets(excel_path: str, sheets: dict[str, pd.DataFrame]) -> None:
+def save_all_sheets(excel_path: str, sheets: dict[str, pd.DataFrame]) -> tuple[int, int]:
+    """
+    Money columns are written back in rupees.
+    Returns the written file's signature (see utils.change_feed).
+    """
     excel_path = Path(excel_path)
     excel_path.parent.mkdir(parents=True, exist_ok=True)
 
-    with pd.ExcelWriter(excel_path, engine="openpyxl") as writer:
-        for name, df in sheets.items():
-            df.to_excel(writer, sheet_name=name, index=False)
+    # Write to a temp file and swap it in, so readers never see a half-written DB
+    fd, tmp_path = tempfile.mkstemp(dir=excel_path.parent, prefix=excel_path.name, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as fh:
+            with pd.ExcelWriter(fh, engine="openpyxl") as writer:
+                for name, df in sheets.items():
+                    money_to_rupees(df, name).to_excel(writer, sheet_name=name, index=False)
+            fh.flush()
+            os.fsync(fh.fileno())
+            written = file_signature(os.fstat(fh.fileno()))  # rename keeps inode and mtime
+        os.replace(tmp_path, excel_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return written
+
+def _thread_lock(excel_path: str) -> threading.Lock:
+    key = os.path.abspath(excel_path)
+    with _write_locks_guard:
+        if key not in _write_locks:
+            _write_locks[key] = threading.Lock()
+        return _write_locks[key]
+
+@contextmanager
+def _file_lock(excel_path: str):
+    # OS lock on "<db>.lock", so the jobs and the app don't write over each other
+    with open(f"{excel_path}.lock", "a+b") as fh:
+        if fcntl:
+            fcntl.flock(fh.fileno(), fcntl.LOCK_EX)
+        else:
+            while True:
+                try:
+                    fh.seek(0)
+                    msvcrt.locking(fh.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:  # LK_LOCK gives up after ~10s; keep waiting
+                    continue
+        try:
+            yield
+        finally:
+            if fcntl:
+                fcntl.flock(fh.fileno(), fcntl.LOCK_UN)
+            else:
+                fh.seek(0)
+                msvcrt.locking(fh.fileno(), msvcrt.LK_UNLCK, 1)
+
+@contextmanager
+def write_lock(excel_path: str):
+    """
+    Lock for read-modify-write cycles on one DB file, across threads and processes
+    (the app's writers and the jobs in app/jobs).
+    """
+    with _thread_lock(excel_path), _file_lock(excel_path):
+        yield
+
+def update_sheets(excel_path: str, mutate) -> None:
+    """
+    Loads fresh sheets, applies mutate(sheets) in place and saves, all under write_lock,
+    so concurrent writers (e.g. logins and the posting queue) don't overwrite each other.
+    mutate may return the customer_ids whose customer/transaction rows it changed;
+    they get a new version in the change feed (see utils.change_feed).
+    """
+    with write_lock(excel_path), get_change_feed(excel_path).writing() as feed:
+        sheets = load_all_sheets(excel_path)
+        changed = mutate(sheets)
+        written = save_all_sheets(excel_path, sheets)
+        feed.record_write(changed or [], written)
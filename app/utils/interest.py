@@ -0,0 +1,152 @@
+import os
+from datetime import date
+import numpy as np
+import pandas as pd
+
+from utils.txn_helpers import add_transaction_rows, signed_amounts
+
+DAYS_IN_YEAR = 365
+DEFAULT_RATES = "SAVINGS:3.5,CURRENT:0"
+
+def load_interest_rates() -> dict[str, float]:
+    """
+    Reads INTEREST_RATES from env, e.g. "SAVINGS:3.5,CURRENT:0" (annual % per account_type).
+    Returns: {account_type: annual_rate_fraction}
+    """
+    raw = os.getenv("INTEREST_RATES", DEFAULT_RATES)
+    rates = {}
+    for part in raw.split(","):
+        if ":" not in part:
+            continue
+        acc_type, pct = part.split(":", 1)
+        rates[acc_type.strip().upper()] = float(pct) / 100.0
+    return rates
+
+def month_bounds(month: str) -> tuple[np.datetime64, np.datetime64]:
+    """
+    "2026-01" -> (first day, first day of next month) as datetime64[D].
+    """
+    start = np.datetime64(month, "M")
+    return start.astype("datetime64[D]"), (start + 1).astype("datetime64[D]")
+
+def accrue_interest(
+    customers: pd.DataFrame,
+    transactions: pd.DataFrame,
+    start: np.datetime64,
+    stop: np.datetime64,
+    rates: dict[str, float]
+) -> np.ndarray:
+    """
+    Daily-balance interest in paise for every account over [start, stop), aligned with
+    customers rows.
+
+    End-of-day balances come from a grouped cumulative sum over the ledger, so each
+    account's balance is held from one posting day to the next without a per-day loop.
+    Balance sums are exact int64; only the final rate multiplication is floating point.
+
+    Whatever current_balance holds beyond the ledger's net (an opening balance that
+    was never posted as a transaction) is treated as held since account creation.
+    """
+    n_accounts = len(customers)
+    if n_accounts == 0:
+        return np.zeros(n_accounts, dtype=np.int64)
+
+    accounts = pd.Index(customers["account_no"].astype(str))
+    codes = accounts.get_indexer(transactions["account_no"].astype(str))
+    days = pd.to_datetime(transactions["txn_ts"].astype(str), errors="coerce").to_numpy().astype("datetime64[D]")
+    amt = signed_amounts(transactions)
+
+    # Reconcile with current_balance: the unexplained remainder is the account's opening balance
+    ledger_net = np.zeros(n_accounts, dtype=np.int64)
+    np.add.at(ledger_net, codes[codes >= 0], amt[codes >= 0])
+    opening = customers["current_balance"].to_numpy(dtype=np.int64) - ledger_net
+    created = customers.get("created_at", pd.Series(pd.NA, index=customers.index)).astype(str)
+    created = pd.to_datetime(created, errors="coerce").to_numpy().astype("datetime64[D]")
+    opened_on = np.where(np.isnat(created), start, created)
+
+    codes = np.r_[codes, np.arange(n_accounts)]
+    days = np.r_[days, opened_on]
+    amt = np.r_[amt, opening]
+
+    keep = (codes >= 0) & ~np.isnat(days) & (days < stop) & (amt != 0)
+    codes, days, amt = codes[keep], days[keep], amt[keep]
+    if codes.size == 0:
+        return np.zeros(n_accounts, dtype=np.int64)
+
+    # Everything before the window is carried in as the opening balance on `start`
+    days = np.maximum(days, start)
+
+    order = np.lexsort((days, codes))
+    codes, days, amt = codes[order], days[order], amt[order]
+
+    # Collapse to one net movement per (account, day)
+    new_group = np.r_[True, (codes[1:] != codes[:-1]) | (days[1:] != days[:-1])]
+    group_idx = np.flatnonzero(new_group)
+    net = np.add.reduceat(amt, group_idx)
+    g_codes = codes[group_idx]
+    g_days = days[group_idx]
+
+    # Grouped cumsum: running total minus the running total before each account's first day
+    csum = np.cumsum(net)
+    acct_first = np.r_[True, g_codes[1:] != g_codes[:-1]]
+    first_pos = np.maximum.accumulate(np.where(acct_first, np.arange(len(net)), 0))
+    balance = csum - (csum[first_pos] - net[first_pos])
+
+    # Each end-of-day balance is held until the account's next posting day (or window end)
+    acct_last = np.r_[acct_first[1:], True]
+    next_day = np.where(acct_last, stop, np.r_[g_days[1:], stop])
+    held_days = (next_day - g_days).astype(np.int64)
+
+    # Sum paise-days per account over each account's run of groups
+    balance_days = np.zeros(n_accounts, dtype=np.int64)
+    first_idx = np.flatnonzero(acct_first)
+    balance_days[g_codes[first_idx]] = np.add.reduceat(np.maximum(balance, 0) * held_days, first_idx)
+
+    acc_types = customers["account_type"].astype(str).str.strip().str.upper()
+    annual_rate = acc_types.map(rates).fillna(0.0).to_numpy(dtype=float)
+    return np.rint(balance_days * annual_rate / DAYS_IN_YEAR).astype(np.int64)
+
+def post_month_end_interest(
+    customers: pd.DataFrame,
+    transactions: pd.DataFrame,
+    month: str,
+    rates: dict[str, float] | None = None
+) -> tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
+    """
+    Accrues interest for `month` ("YYYY-MM") and posts it as INTEREST transactions in one batch.
+    Accounts already credited for that month are skipped, so re-running is safe.
+    Returns: (updated_customers, updated_transactions, posted_rows)
+    """
+    rates = load_interest_rates() if rates is None else rates
+    start, stop = month_bounds(month)
+    reference = f"INT-{month}"
+
+    accrued = accrue_interest(customers, transactions, start, stop, rates)
+
+    already = transactions.loc[
+        transactions["reference"].astype(str) == reference, "account_no"
+    ].astype(str)
+    eligible = (accrued > 0) & ~customers["account_no"].astype(str).isin(already).to_numpy()
+    if not eligible.any():
+        return customers, transactions, transactions.iloc[0:0]
+
+    balances = customers["current_balance"].to_numpy(dtype=np.int64)
+    new_balances = balances + np.where(eligible, accrued, 0)
+    customers["current_balance"] = new_balances
+
+    last_day = date.fromisoformat(str(stop - 1))
+    posted = pd.DataFrame({
+        "customer_id": customers.loc[eligible, "customer_id"].astype(str).to_numpy(),
+        "account_no": customers.loc[eligible, "account_no"].astype(str).to_numpy(),
+        "txn_ts": f"{last_day.isoformat()} 23:59:59",
+        "txn_type": "INTEREST",
+        "amount": accrued[eligible],
+        "balance_after": new_balances[eligible],
+        "channel": "SYSTEM",
+        "reference": reference,
+        "status": "SUCCESS",
+        "remarks": f"Interest for {month}",
+    })
+
+    transactions = add_transaction_rows(transactions, posted)
+    return customers, transactions, transactions.tail(len(posted))
@@ -0,0 +1,76 @@
+from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
+import numpy as np
+import pandas as pd
+
+PAISE_PER_RUPEE = 100
+INT64_MAX = np.iinfo(np.int64).max
+
+# Largest single deposit/withdrawal accepted: ₹ 1,000 crore
+MAX_AMOUNT_PAISE = 10**10 * PAISE_PER_RUPEE
+
+# Columns held as int64 paise in memory (rupees on disk / on screen)
+MONEY_COLUMNS = {
+    "customers": ["opening_balance", "current_balance"],
+    "transactions": ["amount", "balance_after"],
+}
+
+def to_paise(value) -> int:
+    """
+    Parses a rupee amount ("500", "12.5", 99.99) to integer paise, rounding half up.
+    Raises ValueError if it isn't a number or doesn't fit in int64 paise.
+    """
+    try:
+        rupees = Decimal(str(value).strip().replace(",", ""))
+        if not rupees.is_finite():
+            raise ValueError(f"Not a valid amount: {value!r}")
+        paise = int((rupees * PAISE_PER_RUPEE).quantize(Decimal("1"), rounding=ROUND_HALF_UP))
+    except ArithmeticError:  # InvalidOperation, e.g. "abc" or "1e30" (too many digits to quantize)
+        raise ValueError(f"Not a valid amount: {value!r}")
+    if abs(paise) > INT64_MAX:
+        raise ValueError(f"Amount out of range: {value!r}")
+    return paise
+
+def series_to_paise(values: pd.Series) -> np.ndarray:
+    """
+    Vectorized rupees -> int64 paise. Blanks / junk become 0.
+    """
+    rupees = pd.to_numeric(values, errors="coerce").fillna(0.0).to_numpy(dtype=float)
+    return np.rint(rupees * PAISE_PER_RUPEE).astype(np.int64)
+
+def series_to_rupees(values) -> np.ndarray:
+    """
+    int64 paise -> float rupees, for writing to disk (exact to 2 decimals).
+    """
+    return np.asarray(values, dtype=np.int64) / PAISE_PER_RUPEE
+
+def format_inr(paise) -> str:
+    """
+    Paise -> display string in the app's usual style: 12345678 -> "123,456.78".
+    """
+    paise = int(paise)
+    sign = "-" if paise < 0 else ""
+    rupees, rem = divmod(abs(paise), PAISE_PER_RUPEE)
+    return f"{sign}{rupees:,}.{rem:02d}"
+
+def money_to_paise(df: pd.DataFrame, sheet: str) -> pd.DataFrame:
+    for col in MONEY_COLUMNS.get(sheet, []):
+        if col in df.columns:
+            df[col] = series_to_paise(df[col])
+    return df
+
+def money_to_rupees(df: pd.DataFrame, sheet: str) -> pd.DataFrame:
+    df = df.copy()
+    for col in MONEY_COLUMNS.get(sheet, []):
+        if col in df.columns:
+            df[col] = series_to_rupees(df[col])
+    return df
+
+def money_view(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Copy of a transactions frame with money columns formatted for display.
+    """
+    df = df.copy()
+    for col in MONEY_COLUMNS["transactions"]:
+        if col in df.columns:
+            df[col] = [format_inr(v) for v in df[col]]
+    return df
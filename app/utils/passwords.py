@@ -0,0 +1,69 @@
+import os
+import hmac
+import hashlib
+import secrets
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+SCHEME = "pbkdf2_sha256"
+DEFAULT_ITERATIONS = 200_000
+SALT_BYTES = 16
+
+def hash_iterations() -> int:
+    return int(os.getenv("PASSWORD_HASH_ITERATIONS", str(DEFAULT_ITERATIONS)))
+
+def _pepper() -> bytes:
+    # PASSWORD_SALT from .env is a server-side secret mixed into every hash
+    return os.getenv("PASSWORD_SALT", "").encode("utf-8")
+
+def _derive(password: str, salt: bytes, iterations: int) -> bytes:
+    return hashlib.pbkdf2_hmac("sha256", _pepper() + password.encode("utf-8"), salt, iterations)
+
+def is_hashed(stored: str) -> bool:
+    return str(stored).startswith(SCHEME + "$")
+
+def hash_password(password: str, iterations: int | None = None) -> str:
+    """
+    Returns "pbkdf2_sha256$<iterations>$<salt_hex>$<hash_hex>" with a fresh random salt.
+    """
+    iterations = iterations or hash_iterations()
+    salt = secrets.token_bytes(SALT_BYTES)
+    return f"{SCHEME}${iterations}${salt.hex()}${_derive(password, salt, iterations).hex()}"
+
+def check_password(password: str, stored: str) -> bool:
+    try:
+        _, iterations, salt_hex, hash_hex = str(stored).split("$")
+        expected = bytes.fromhex(hash_hex)
+        actual = _derive(password, bytes.fromhex(salt_hex), int(iterations))
+    except ValueError:
+        return False
+    return hmac.compare_digest(actual, expected)
+
+def needs_rehash(stored: str) -> bool:
+    """
+    True for legacy plain text and for hashes made with a different work factor.
+    """
+    if not is_hashed(stored):
+        return True
+    return str(stored).split("$")[1] != str(hash_iterations())
+
+_pool: ThreadPoolExecutor | None = None
+_pool_lock = threading.Lock()
+
+def _get_pool() -> ThreadPoolExecutor:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            workers = int(os.getenv("PASSWORD_HASH_WORKERS", str(min(4, os.cpu_count() or 1))))
+            _pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="pwhash")
+    return _pool
+
+def verify_password(password: str, stored: str, timeout: float | None = 30.0) -> bool:
+    """
+    Runs the KDF on a bounded worker pool (hashlib releases the GIL while hashing),
+    so logins can't pile up unbounded CPU work.
+    """
+    return _get_pool().submit(check_password, password, stored).result(timeout=timeout)
+
+def hash_password_pooled(password: str, timeout: float | None = 30.0) -> str:
+    return _get_pool().submit(hash_password, password).result(timeout=timeout)
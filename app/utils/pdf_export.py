@@ -11,6 +11,8 @@ from reportlab.platypus import (
 )
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 
+from utils.money import format_inr
+
 
 def _now_str() -> str:
     return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
@@ -94,7 +96,7 @@ def build_mini_statement_pdf(
     acc_type = customer.get("account_type", "NA")
     phone = customer.get("phone", "NA")
     email = customer.get("email", "NA")
-    balance = customer.get("current_balance", 0.0)
+    balance = customer.get("current_balance", 0)
 
     info_left = [
         f"<b>Customer Name:</b> {cust_name}",
@@ -105,7 +107,7 @@ def build_mini_statement_pdf(
     info_right = [
         f"<b>Phone:</b> {phone}",
         f"<b>Email:</b> {email}",
-        f"<b>Current Balance:</b> INR {float(balance):,.2f}",
+        f"<b>Current Balance:</b> INR {format_inr(balance)}",
         f"<b>Status:</b> {customer.get('account_status', 'NA')}",
     ]
 
@@ -145,11 +147,11 @@ def build_mini_statement_pdf(
         cols = ["txn_ts", "txn_id", "txn_type", "amount", "balance_after", "status", "remarks"]
         available = [c for c in cols if c in df.columns]
 
-        # Format numeric columns
+        # Format money columns (int paise)
         if "amount" in df.columns:
-            df["amount"] = df["amount"].apply(lambda x: f"INR {float(x):,.2f}" if str(x).strip() != "" else "")
+            df["amount"] = df["amount"].apply(lambda x: f"INR {format_inr(x)}" if str(x).strip() != "" else "")
         if "balance_after" in df.columns:
-            df["balance_after"] = df["balance_after"].apply(lambda x: f"INR {float(x):,.2f}" if str(x).strip() != "" else "")
+            df["balance_after"] = df["balance_after"].apply(lambda x: f"INR {format_inr(x)}" if str(x).strip() != "" else "")
 
         table_data = [ [c.replace("_", " ").upper() for c in available] ]
         for _, row in df[available].iterrows():
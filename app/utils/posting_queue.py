@@ -0,0 +1,218 @@
+import os
+import queue
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+import numpy as np
+import pandas as pd
+
+from utils.data_store import load_all_sheets, save_all_sheets, write_lock
+from utils.change_feed import ChangeFeed, get_change_feed
+from utils.money import format_inr, MAX_AMOUNT_PAISE
+from utils.txn_helpers import add_transaction_rows, now_str
+
+METRICS_WINDOW = 1000
+
+@dataclass
+class PostingRequest:
+    customer_id: str
+    txn_type: str
+    amount: int  # paise
+    channel: str = "ONLINE"
+    reference: str = ""
+    remarks: str = ""
+    status: str = "SUCCESS"
+    enqueued_at: float = field(default_factory=time.perf_counter)
+    done: threading.Event = field(default_factory=threading.Event)
+    result: tuple | None = None
+    error: Exception | None = None
+
+class PostingQueue:
+    """
+    Group commit for deposits/withdrawals.
+
+    Requests arriving within `max_wait_ms` of each other (up to `max_batch`) are applied
+    together and persisted with one save_all_sheets; each caller then gets its own result.
+    """
+
+    def __init__(self, excel_path: str, max_batch: int = 50, max_wait_ms: float = 5.0):
+        self.excel_path = excel_path
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000.0
+        self._q: queue.Queue[PostingRequest] = queue.Queue()
+        self._batch_sizes = deque(maxlen=METRICS_WINDOW)
+        self._wait_ms = deque(maxlen=METRICS_WINDOW)
+        self._commit_ms = deque(maxlen=METRICS_WINDOW)
+        self._totals = {"batches": 0, "postings": 0, "errors": 0}
+        self._metrics_lock = threading.Lock()
+        self._worker = threading.Thread(target=self._run, name="posting-queue", daemon=True)
+        self._worker.start()
+
+    def submit(self, req: PostingRequest, timeout: float | None = 30.0) -> tuple[bool, str, str, int]:
+        """
+        Blocks until the batch containing `req` is committed.
+        Returns: (success, message, txn_id, balance_after_paise)
+        """
+        self._q.put(req)
+        if not req.done.wait(timeout):
+            raise TimeoutError("Posting was not committed in time.")
+        if req.error is not None:
+            raise req.error
+        return req.result
+
+    def _collect(self) -> list[PostingRequest]:
+        batch = [self._q.get()]
+        deadline = time.perf_counter() + self.max_wait
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._q.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self) -> None:
+        while True:
+            batch = self._collect()
+            started = time.perf_counter()
+            try:
+                with write_lock(self.excel_path), get_change_feed(self.excel_path).writing() as feed:
+                    self._commit(batch, feed)
+            except Exception as e:
+                for req in batch:
+                    req.error = e
+                with self._metrics_lock:
+                    self._totals["errors"] += 1
+            finished = time.perf_counter()
+
+            with self._metrics_lock:
+                self._totals["batches"] += 1
+                self._totals["postings"] += len(batch)
+                self._batch_sizes.append(len(batch))
+                self._commit_ms.append((finished - started) * 1000)
+                self._wait_ms.extend((started - r.enqueued_at) * 1000 for r in batch)
+
+            for req in batch:
+                req.done.set()
+
+    def _commit(self, batch: list[PostingRequest], feed: ChangeFeed) -> None:
+        sheets = load_all_sheets(self.excel_path)
+        customers = sheets["customers"]
+        transactions = sheets["transactions"]
+
+        pos = {cid: i for i, cid in enumerate(customers["customer_id"].astype(str))}
+        balances = customers["current_balance"].to_numpy(dtype=np.int64).copy()
+        accounts = customers["account_no"].astype(str).to_numpy()
+
+        rows, results = [], []
+        for req in batch:
+            # One caller's bad request must not fail everyone else's posting in the batch
+            try:
+                row, result = self._apply(req, pos, balances, accounts)
+            except (ValueError, TypeError, OverflowError) as e:
+                results.append((False, f"Posting rejected: {e}", "", 0))
+                continue
+            if row is not None:
+                rows.append(row)
+            results.append(result)
+
+        if not rows:
+            for req, res in zip(batch, results):
+                req.result = res
+            return
+
+        transactions = add_transaction_rows(transactions, pd.DataFrame(rows))
+        customers["current_balance"] = balances
+
+        sheets["customers"] = customers
+        sheets["transactions"] = transactions
+        written = save_all_sheets(self.excel_path, sheets)
+        feed.record_write((r["customer_id"] for r in rows), written)
+
+        new_ids = iter(transactions["txn_id"].tail(len(rows)).tolist())
+        for req, (ok, msg, txn_id, bal) in zip(batch, results):
+            req.result = (ok, msg, txn_id if txn_id is not None else next(new_ids), bal)
+
+    def _apply(self, req: PostingRequest, pos: dict, balances: np.ndarray, accounts: np.ndarray) -> tuple[dict | None, tuple]:
+        """
+        Applies one request to `balances` in place.
+        Returns: (ledger row or None, (success, message, txn_id or None, balance_after_paise))
+        """
+        i = pos.get(str(req.customer_id))
+        if i is None:
+            return None, (False, "Customer not found.", "", 0)
+
+        amount = int(req.amount)
+        if not 0 < amount <= MAX_AMOUNT_PAISE:
+            raise ValueError(f"amount out of range ({amount} paise)")
+        new_balance = int(balances[i]) + (amount if req.txn_type != "WITHDRAW" else -amount)
+
+        status, remarks, msg = req.status, req.remarks, "OK"
+        if status == "SUCCESS" and req.txn_type == "WITHDRAW" and new_balance < 0:
+            status = "FAILED"
+            msg = f"Insufficient balance. You can withdraw up to ₹ {format_inr(balances[i])}"
+            remarks = msg
+        elif status == "SUCCESS":
+            balances[i] = new_balance  # raises OverflowError past int64, before anything is changed
+
+        row = {
+            "customer_id": str(req.customer_id),
+            "account_no": accounts[i],
+            "txn_ts": now_str(),
+            "txn_type": req.txn_type,
+            "amount": amount,
+            "balance_after": int(balances[i]),
+            "channel": req.channel,
+            "reference": req.reference,
+            "status": status,
+            "remarks": remarks,
+        }
+        return row, (status == "SUCCESS", msg if status == "SUCCESS" else remarks, None, int(balances[i]))
+
+    def metrics(self) -> dict:
+        """
+        Totals plus p50/p95 of batch size, queue wait (ms) and commit latency (ms)
+        over the last METRICS_WINDOW batches.
+        """
+        def pct(values, q):
+            return float(np.percentile(values, q)) if values else 0.0
+
+        with self._metrics_lock:
+            sizes, waits, commits = list(self._batch_sizes), list(self._wait_ms), list(self._commit_ms)
+            out = dict(self._totals)
+
+        out.update({
+            "batch_size_avg": float(np.mean(sizes)) if sizes else 0.0,
+            "batch_size_max": max(sizes) if sizes else 0,
+            "wait_ms_p50": pct(waits, 50),
+            "wait_ms_p95": pct(waits, 95),
+            "commit_ms_p50": pct(commits, 50),
+            "commit_ms_p95": pct(commits, 95),
+        })
+        return out
+
+_queues: dict[str, PostingQueue] = {}
+_queues_lock = threading.Lock()
+
+def get_posting_queue(excel_path: str) -> PostingQueue:
+    """
+    One queue (and writer thread) per DB file for the whole process.
+    """
+    key = os.path.abspath(excel_path)
+    with _queues_lock:
+        if key not in _queues:
+            _queues[key] = PostingQueue(
+                excel_path,
+                max_batch=int(os.getenv("POSTING_BATCH_MAX", "50")),
+                max_wait_ms=float(os.getenv("POSTING_BATCH_WAIT_MS", "5")),
+            )
+        return _queues[key]
+
+def post_transaction(excel_path: str, **kwargs) -> tuple[bool, str, str, int]:
+    """
+    Convenience wrapper for pages: post_transaction(DB_EXCEL_PATH, customer_id=..., txn_type=..., amount=...)
+    """
+    return get_posting_queue(excel_path).submit(PostingRequest(**kwargs))
@@ -1,6 +1,16 @@
 from datetime import datetime
+import numpy as np
 import pandas as pd
 
+TXN_COLUMNS = [
+    "txn_id", "customer_id", "account_no", "txn_ts", "txn_type", "amount",
+    "balance_after", "channel", "reference", "status", "remarks"
+]
+
+# Types that add to / take from the balance (BALANCE_FWD carries archived history)
+CREDIT_TYPES = ["DEPOSIT", "INTEREST", "BALANCE_FWD"]
+DEBIT_TYPES = ["WITHDRAW"]
+
 def now_str() -> str:
     return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
@@ -32,8 +42,8 @@ def add_transaction_row(
     customer_id: str,
     account_no: str,
     txn_type: str,
-    amount: float,
-    balance_after: float,
+    amount: int,
+    balance_after: int,
     channel: str = "ONLINE",
     reference: str = "SELF",
     status: str = "SUCCESS",
@@ -61,3 +71,36 @@ def add_transaction_row(
             transactions_df[k] = ""
 
     return pd.concat([transactions_df, pd.DataFrame([row])], ignore_index=True)
+
+def add_transaction_rows(transactions_df: pd.DataFrame, rows: pd.DataFrame) -> pd.DataFrame:
+    """
+    Bulk version of add_transaction_row: assigns consecutive txn ids to all rows
+    and appends them with a single concat.
+    """
+    if rows.empty:
+        return transactions_df
+
+    rows = rows.copy()
+    first = int(next_txn_id(transactions_df)[1:])
+    rows["txn_id"] = [f"T{n:07d}" for n in range(first, first + len(rows))]
+    if "txn_ts" not in rows.columns:
+        rows["txn_ts"] = now_str()
+
+    for k in TXN_COLUMNS:
+        if k not in transactions_df.columns:
+            transactions_df[k] = ""
+        if k not in rows.columns:
+            rows[k] = ""
+
+    return pd.concat([transactions_df, rows[TXN_COLUMNS]], ignore_index=True)
+
+def signed_amounts(transactions_df: pd.DataFrame) -> np.ndarray:
+    """
+    Amount in paise with sign applied (+credit / -debit). FAILED rows and unknown types count as 0.
+    """
+    txn_type = transactions_df["txn_type"].astype(str).str.upper()
+    ok = transactions_df["status"].astype(str).str.upper() == "SUCCESS"
+    amount = pd.to_numeric(transactions_df["amount"], errors="coerce").fillna(0).to_numpy(dtype=np.int64)
+
+    sign = np.where(txn_type.isin(CREDIT_TYPES), 1, np.where(txn_type.isin(DEBIT_TYPES), -1, 0))
+    return np.where(ok.to_numpy(), sign * amount, 0).astype(np.int64)
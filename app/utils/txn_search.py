@@ -0,0 +1,180 @@
+import re
+import threading
+import numpy as np
+import pandas as pd
+
+from utils.archive import BALANCE_FWD, customer_history, needs_archive, read_manifest
+
+TOKEN_RE = re.compile(r"[a-z0-9]+")
+MAX_CACHED_QUERIES = 32
+MAX_CACHED_INDEXES = 64  # per (customer, with/without archive)
+
+def tokenize(text: str) -> list[str]:
+    return TOKEN_RE.findall(str(text).lower())
+
+class TxnIndex:
+    """
+    Secondary indexes over one customer's transactions.
+
+    Rows are kept in (txn_ts, txn_id) order and addressed by position. Every filter
+    resolves to a sorted array of positions, so a page is a binary search for the
+    cursor plus a slice, whatever page number it is.
+    """
+
+    def __init__(self, tx: pd.DataFrame):
+        tx = tx.copy()
+        tx["txn_ts"] = tx["txn_ts"].astype(str)
+        tx["txn_id"] = tx["txn_id"].astype(str)
+        self.rows = tx.sort_values(by=["txn_ts", "txn_id"], kind="stable").reset_index(drop=True)
+        n = len(self.rows)
+
+        ts = pd.to_datetime(self.rows["txn_ts"], errors="coerce")
+        self.ts = ts.to_numpy().astype("datetime64[s]")
+        self.pos_of = dict(zip(self.rows["txn_id"], range(n)))
+
+        amount = pd.to_numeric(self.rows["amount"], errors="coerce").fillna(0).to_numpy(dtype=np.int64)
+        self.amount_order = np.argsort(amount, kind="stable")
+        self.amount_sorted = amount[self.amount_order]
+
+        self.by_type = {
+            t: np.flatnonzero(self.rows["txn_type"].astype(str).str.upper().to_numpy() == t)
+            for t in self.rows["txn_type"].astype(str).str.upper().unique()
+        }
+
+        # Inverted index on remarks / reference / txn_id tokens
+        postings: dict[str, list[int]] = {}
+        text = (
+            self.rows["remarks"].fillna("").astype(str) + " "
+            + self.rows["reference"].fillna("").astype(str) + " "
+            + self.rows["txn_id"]
+        )
+        for pos, value in enumerate(text):
+            for tok in set(tokenize(value)):
+                postings.setdefault(tok, []).append(pos)
+        self.tokens = {tok: np.array(p, dtype=np.int64) for tok, p in postings.items()}
+
+        self._queries: dict[tuple, np.ndarray] = {}
+        self._lock = threading.Lock()
+
+    def _candidates(self, key: tuple) -> np.ndarray:
+        with self._lock:
+            if key in self._queries:
+                return self._queries[key]
+
+        date_from, date_to, types, amount_min, amount_max, text = key
+
+        # Date range is a contiguous run of positions
+        lo = 0 if date_from is None else np.searchsorted(self.ts, np.datetime64(date_from, "s"), side="left")
+        hi = len(self.rows) if date_to is None else np.searchsorted(
+            self.ts, (np.datetime64(date_to, "D") + 1).astype("datetime64[s]"), side="left"
+        )
+        result = np.arange(lo, hi, dtype=np.int64)
+
+        if types:
+            hits = [self.by_type.get(t, np.empty(0, dtype=np.int64)) for t in types]
+            result = np.intersect1d(result, np.concatenate(hits), assume_unique=True)
+
+        if amount_min is not None or amount_max is not None:
+            a_lo = 0 if amount_min is None else np.searchsorted(self.amount_sorted, amount_min, side="left")
+            a_hi = len(self.amount_sorted) if amount_max is None else np.searchsorted(
+                self.amount_sorted, amount_max, side="right"
+            )
+            result = np.intersect1d(result, np.sort(self.amount_order[a_lo:a_hi]), assume_unique=True)
+
+        for tok in tokenize(text):
+            result = np.intersect1d(result, self.tokens.get(tok, np.empty(0, dtype=np.int64)), assume_unique=True)
+
+        with self._lock:
+            if len(self._queries) >= MAX_CACHED_QUERIES:
+                self._queries.pop(next(iter(self._queries)))
+            self._queries[key] = result
+        return result
+
+    def search(
+        self,
+        date_from=None,
+        date_to=None,
+        types: list[str] | None = None,
+        amount_min: int | None = None,
+        amount_max: int | None = None,
+        text: str = "",
+        after_txn_id: str | None = None,
+        page_size: int = 20
+    ) -> tuple[pd.DataFrame, str | None, int]:
+        """
+        Newest-first search with keyset pagination. Amount bounds are in paise.
+        Pass the returned cursor as `after_txn_id` to get the next page.
+        Returns: (page_rows, next_cursor_or_None, total_matches)
+        """
+        key = (
+            None if date_from is None else str(date_from),
+            None if date_to is None else str(date_to),
+            tuple(sorted(t.upper() for t in (types or []))),
+            amount_min,
+            amount_max,
+            " ".join(tokenize(text)),
+        )
+        cand = self._candidates(key)
+
+        end = len(cand)
+        if after_txn_id is not None and after_txn_id in self.pos_of:
+            end = int(np.searchsorted(cand, self.pos_of[after_txn_id], side="left"))
+
+        page_pos = cand[max(0, end - page_size):end][::-1]
+        page = self.rows.iloc[page_pos]
+
+        next_cursor = page["txn_id"].iloc[-1] if end - page_size > 0 and not page.empty else None
+        return page, next_cursor, len(cand)
+
+_indexes: dict[tuple[str, bool], tuple[tuple, TxnIndex]] = {}
+_indexes_lock = threading.Lock()
+
+def get_txn_index(transactions_df: pd.DataFrame, customer_id: str, archive_dir: str | None = None) -> TxnIndex:
+    """
+    Cached per-customer index; rebuilt only when that customer's rows change.
+    With `archive_dir`, the index also covers that customer's archived history.
+    At most MAX_CACHED_INDEXES are kept; the least recently built goes first.
+    """
+    customer_id = str(customer_id)
+    tx = transactions_df[transactions_df["customer_id"].astype(str) == customer_id]
+    signature = (len(tx), str(tx["txn_id"].iloc[-1]) if len(tx) else "")
+    if archive_dir is not None:
+        signature += (read_manifest(archive_dir)["cutoff"],)
+
+    key = (customer_id, archive_dir is not None)
+    with _indexes_lock:
+        cached = _indexes.get(key)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+
+    if archive_dir is not None:
+        tx = customer_history(transactions_df, customer_id, archive_dir, all_history=True)
+    index = TxnIndex(tx)
+    with _indexes_lock:
+        _indexes.pop(key, None)
+        if len(_indexes) >= MAX_CACHED_INDEXES:
+            _indexes.pop(next(iter(_indexes)))
+        _indexes[key] = (signature, index)
+    return index
+
+def search_transactions(
+    transactions_df: pd.DataFrame,
+    customer_id: str,
+    archive_dir: str,
+    after_txn_id: str | None = None,
+    page_size: int = 20,
+    **query
+) -> tuple[pd.DataFrame, str | None, int, bool]:
+    """
+    Searches the hot set, or the archive-inclusive index when the requested range
+    reaches before the archive cutoff and this customer has archived history (a
+    BALANCE_FWD row). Every page of one query comes from the same index, so the
+    total stays the same while paging.
+    Returns: (page_rows, next_cursor_or_None, total_matches, used_archive)
+    """
+    hot = get_txn_index(transactions_df, customer_id)
+    reaches_back = BALANCE_FWD in hot.by_type and needs_archive(archive_dir, query.get("date_from"))
+
+    index = get_txn_index(transactions_df, customer_id, archive_dir=archive_dir) if reaches_back else hot
+    page, next_cursor, total = index.search(after_txn_id=after_txn_id, page_size=page_size, **query)
+    return page, next_cursor, total, reaches_back
@@ -1,13 +1,23 @@
-def validate_amount(value) -> tuple[bool, str, float]:
+from decimal import Decimal
+
+from utils.money import to_paise, format_inr, PAISE_PER_RUPEE, MAX_AMOUNT_PAISE
+
+def validate_amount(value) -> tuple[bool, str, int]:
     """
-    Returns: (ok, message, amount_float)
+    Returns: (ok, message, amount_paise)
     """
     try:
-        amt = float(value)
-    except Exception:
-        return False, "Please enter a valid numeric amount.", 0.0
+        amt = to_paise(value)
+    except ValueError:
+        return False, "Please enter a valid numeric amount.", 0
+
+    if Decimal(str(value).strip().replace(",", "")) * PAISE_PER_RUPEE != amt:
+        return False, "Amount can have at most 2 decimal places.", 0
 
     if amt <= 0:
-        return False, "Amount must be greater than 0.", 0.0
+        return False, "Amount must be greater than 0.", 0
+
+    if amt > MAX_AMOUNT_PAISE:
+        return False, f"Amount can't exceed ₹ {format_inr(MAX_AMOUNT_PAISE)}.", 0
 
     return True, "OK", amt
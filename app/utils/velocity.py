@@ -0,0 +1,200 @@
+import os
+import threading
+from datetime import datetime
+import pandas as pd
+
+from utils.money import format_inr, to_paise
+
+WINDOWS = {"HOUR": 3600, "DAY": 86400}
+BUCKETS_PER_WINDOW = 60
+DEFAULT_LIMITS = "ALL:HOUR:50000:5,ALL:DAY:200000:20"
+
+_EPOCH = datetime(1970, 1, 1)
+
+def ts_seconds(dt: datetime | None = None) -> float:
+    """
+    Naive local datetime -> seconds, same clock as the txn_ts strings we store.
+    """
+    return ((dt or datetime.now()) - _EPOCH).total_seconds()
+
+def load_withdraw_limits() -> list[tuple[str, str, int, int]]:
+    """
+    Reads WITHDRAW_LIMITS from env as comma separated SCOPE:WINDOW:MAX_AMOUNT:MAX_COUNT,
+    e.g. "ALL:HOUR:50000:5,ATM:DAY:25000:5". SCOPE is ALL (every channel) or a channel name.
+    MAX_AMOUNT is in rupees; it is returned in paise.
+    """
+    raw = os.getenv("WITHDRAW_LIMITS", DEFAULT_LIMITS)
+    limits = []
+    for part in raw.split(","):
+        bits = [b.strip().upper() for b in part.split(":")]
+        if len(bits) != 4 or bits[1] not in WINDOWS:
+            continue
+        limits.append((bits[0], bits[1], to_paise(bits[2]), int(bits[3])))
+    return limits
+
+class SlidingWindowCounter:
+    """
+    Amount/count totals over a sliding window, kept in a ring of fixed-width buckets.
+    Adds and reads are O(1); the window is accurate to one bucket width.
+    """
+
+    def __init__(self, window_sec: int, n_buckets: int = BUCKETS_PER_WINDOW):
+        self.n = n_buckets
+        self.bucket_sec = window_sec / n_buckets
+        self.amounts = [0] * n_buckets
+        self.counts = [0] * n_buckets
+        self.total_amount = 0
+        self.total_count = 0
+        self.head = None
+
+    def _advance(self, bucket: int) -> None:
+        if self.head is None:
+            self.head = bucket
+            return
+        if bucket <= self.head:
+            return
+
+        # Expire the buckets we moved past (at most one full lap)
+        for i in range(1, min(bucket - self.head, self.n) + 1):
+            slot = (self.head + i) % self.n
+            self.total_amount -= self.amounts[slot]
+            self.total_count -= self.counts[slot]
+            self.amounts[slot] = 0
+            self.counts[slot] = 0
+        self.head = bucket
+
+    def add(self, ts: float, amount: int) -> None:
+        bucket = int(ts // self.bucket_sec)
+        self._advance(bucket)
+        if bucket <= self.head - self.n:
+            return  # already outside the window
+
+        slot = bucket % self.n
+        self.amounts[slot] += amount
+        self.counts[slot] += 1
+        self.total_amount += amount
+        self.total_count += 1
+
+    def remove(self, ts: float, amount: int) -> None:
+        """
+        Undoes an add(ts, amount) that is still inside the window.
+        """
+        bucket = int(ts // self.bucket_sec)
+        if self.head is None or bucket <= self.head - self.n or bucket > self.head:
+            return  # already expired (or never added)
+
+        slot = bucket % self.n
+        if self.counts[slot] == 0:
+            return
+        self.amounts[slot] -= amount
+        self.counts[slot] -= 1
+        self.total_amount -= amount
+        self.total_count -= 1
+
+    def totals(self, ts: float) -> tuple[int, int]:
+        self._advance(int(ts // self.bucket_sec))
+        return self.total_amount, self.total_count
+
+class VelocityTracker:
+    """
+    Per-account (and per-channel) withdrawal counters checked against WITHDRAW_LIMITS.
+    """
+
+    def __init__(self, limits: list[tuple[str, str, int, int]]):
+        self.limits = limits
+        self._counters: dict[tuple[str, str, str], SlidingWindowCounter] = {}
+        self._lock = threading.Lock()
+
+    def _counter(self, account_no: str, scope: str, window: str) -> SlidingWindowCounter:
+        key = (account_no, scope, window)
+        if key not in self._counters:
+            self._counters[key] = SlidingWindowCounter(WINDOWS[window])
+        return self._counters[key]
+
+    def _applicable(self, channel: str):
+        channel = (channel or "").upper()
+        return [lim for lim in self.limits if lim[0] in ("ALL", channel)]
+
+    def _record(self, account_no: str, channel: str, amount: int, ts: float) -> None:
+        for scope, window, _, _ in self._applicable(channel):
+            self._counter(account_no, scope, window).add(ts, amount)
+
+    def check_and_record(
+        self,
+        account_no: str,
+        channel: str,
+        amount: int,
+        ts: float | None = None
+    ) -> tuple[bool, str]:
+        """
+        Returns: (ok, reason). On success the withdrawal is counted immediately,
+        so two sessions can't both squeeze under the same limit; call release() with
+        the same `ts` if the posting then fails.
+        """
+        account_no = str(account_no)
+        ts = ts_seconds() if ts is None else ts
+
+        with self._lock:
+            for scope, window, max_amount, max_count in self._applicable(channel):
+                total, count = self._counter(account_no, scope, window).totals(ts)
+                label = "Hourly" if window == "HOUR" else "Daily"
+                where = "" if scope == "ALL" else f" ({scope})"
+                if count + 1 > max_count:
+                    return False, f"{label} withdrawal count limit reached{where}: max {max_count}"
+                if total + amount > max_amount:
+                    return False, (
+                        f"{label} withdrawal amount limit exceeded{where}: "
+                        f"₹ {format_inr(max(max_amount - total, 0))} remaining"
+                    )
+
+            self._record(account_no, channel, amount, ts)
+        return True, "OK"
+
+    def release(self, account_no: str, channel: str, amount: int, ts: float) -> None:
+        """
+        Gives back a check_and_record() reservation whose withdrawal didn't go through,
+        so rejected attempts don't use up the limit (rebuild only replays SUCCESS rows).
+        """
+        with self._lock:
+            for scope, window, _, _ in self._applicable(channel):
+                self._counter(str(account_no), scope, window).remove(ts, amount)
+
+    def rebuild(self, transactions_df: pd.DataFrame, now: float | None = None) -> None:
+        """
+        Replays successful withdrawals from the largest window into fresh counters.
+        """
+        now = ts_seconds() if now is None else now
+        horizon = now - max(WINDOWS[w] for _, w, _, _ in self.limits) if self.limits else now
+
+        with self._lock:
+            self._counters = {}
+            if transactions_df.empty or not self.limits:
+                return
+
+            ts = pd.to_datetime(transactions_df["txn_ts"].astype(str), errors="coerce")
+            secs = (ts - pd.Timestamp(_EPOCH)).dt.total_seconds()
+            mask = (
+                (transactions_df["txn_type"].astype(str).str.upper() == "WITHDRAW")
+                & (transactions_df["status"].astype(str).str.upper() == "SUCCESS")
+                & (secs >= horizon)
+            )
+            recent = transactions_df[mask]
+            amounts = pd.to_numeric(recent["amount"], errors="coerce").fillna(0)
+            for acc, ch, amt, t in zip(recent["account_no"].astype(str), recent["channel"].astype(str),
+                                       amounts, secs[mask]):
+                self._record(acc, ch, int(amt), float(t))
+
+_tracker: VelocityTracker | None = None
+_tracker_lock = threading.Lock()
+
+def get_velocity_tracker(transactions_df: pd.DataFrame) -> VelocityTracker:
+    """
+    Process-wide tracker, built from the ledger the first time a page asks for it.
+    """
+    global _tracker
+    with _tracker_lock:
+        if _tracker is None:
+            tracker = VelocityTracker(load_withdraw_limits())
+            tracker.rebuild(transactions_df)
+            _tracker = tracker
+    return _tracker